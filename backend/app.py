@@ -3,27 +3,60 @@ ElasticRev - Dynamic Pricing Optimization API
 Main Flask application with REST endpoints
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from models import db, Product, Sale, PriceHistory, ElasticityResult, Scenario, CompetitorPrice
 from elasticity import ElasticityCalculator, calculate_revenue_optimization
 from scenarios import ScenarioSimulator
+from queries import get_latest_elasticity, get_latest_elasticities
 from config import *
 import pandas as pd
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_, desc, select
+from sqlalchemy.orm import joinedload
 import os
 import traceback
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.chart import LineChart, Reference
 import io
+import orjson
 
 from flask import send_from_directory
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+    
+    Keys stay sorted like Flask's default. Types orjson doesn't handle natively,
+    and dates (to keep Flask's HTTP date format), go through Flask's default.
+    """
+    option = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = SQLALCHEMY_TRACK_MODIFICATIONS
 app.config['SECRET_KEY'] = SECRET_KEY
@@ -53,7 +86,11 @@ def initialize_database():
         db.create_all()
         
         # Import seed function
-        from database import seed_database_if_empty
+        from database import ensure_column_defaults, ensure_indexes, seed_database_if_empty
+        
+        # Bring indexes and column defaults on pre-existing tables up to date
+        ensure_indexes()
+        ensure_column_defaults()
         
         # Seed data if database is empty
         seed_database_if_empty(app)
@@ -134,15 +171,16 @@ def get_products():
         
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         
+        # Latest elasticity for the whole page in one query, if requested
+        if include_elasticity:
+            elasticities = get_latest_elasticities([product.id for product in pagination.items])
+        
         products = []
         for product in pagination.items:
             product_dict = product.to_dict()
             
-            # Include latest elasticity if requested
             if include_elasticity:
-                latest_elasticity = ElasticityResult.query.filter_by(
-                    product_id=product.id
-                ).order_by(ElasticityResult.calculation_date.desc()).first()
+                latest_elasticity = elasticities.get(product.id)
                 
                 if latest_elasticity:
                     product_dict['elasticity'] = latest_elasticity.to_dict()
@@ -178,9 +216,7 @@ def get_product(product_id):
         ).filter_by(product_id=product_id).first()
         
         # Get latest elasticity
-        latest_elasticity = ElasticityResult.query.filter_by(
-            product_id=product_id
-        ).order_by(ElasticityResult.calculation_date.desc()).first()
+        latest_elasticity = get_latest_elasticity(product_id)
         
         result = product.to_dict()
         result['statistics'] = {
@@ -220,36 +256,89 @@ def get_categories():
 
 # ==================== Sales API ====================
 
+# Column sets for the read-only list/stream endpoints. These are selected with
+# Core so no ORM instances (identity map, change tracking) are built per row.
+SALE_COLUMNS = (
+    Sale.id, Sale.product_id, Sale.date, Sale.quantity, Sale.price, Sale.revenue,
+    Sale.cost, Sale.profit, Sale.discount_percent, Sale.competitor_price,
+    Sale.season, Sale.day_of_week, Sale.is_holiday, Sale.promotion_active
+)
+
+COMPETITOR_PRICE_COLUMNS = (
+    CompetitorPrice.id, CompetitorPrice.product_id, CompetitorPrice.competitor_name,
+    CompetitorPrice.competitor_price, CompetitorPrice.date
+)
+
+
+def _row_filters(model):
+    """Build product/date WHERE clauses for `model` from the query string"""
+    product_id = request.args.get('product_id', type=int)
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    
+    filters = []
+    
+    if product_id:
+        filters.append(model.product_id == product_id)
+    
+    if start_date:
+        filters.append(model.date >= datetime.fromisoformat(start_date).date())
+    
+    if end_date:
+        filters.append(model.date <= datetime.fromisoformat(end_date).date())
+    
+    return filters
+
+
+def _stream_json_rows(stmt, partition_size=1000):
+    """Yield the statement's rows as one JSON array, encoding a partition at a time"""
+    result = db.session.execute(stmt.execution_options(yield_per=partition_size))
+    
+    yield b'['
+    separator = b''
+    for partition in result.mappings().partitions():
+        # Strip the brackets so consecutive partitions join into one array
+        yield separator + orjson.dumps([dict(row) for row in partition])[1:-1]
+        separator = b','
+    yield b']'
+
+
 @app.route('/api/sales', methods=['GET'])
 def get_sales():
     """Get sales data with filtering"""
     try:
-        product_id = request.args.get('product_id', type=int)
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 100))
         
-        query = Sale.query
+        # Clamp the same way Flask-SQLAlchemy's paginate() did
+        page = max(page, 1)
+        per_page = per_page if per_page >= 1 else 20
         
-        if product_id:
-            query = query.filter_by(product_id=product_id)
+        filters = _row_filters(Sale)
         
-        if start_date:
-            query = query.filter(Sale.date >= datetime.fromisoformat(start_date).date())
-        
-        if end_date:
-            query = query.filter(Sale.date <= datetime.fromisoformat(end_date).date())
+        total = db.session.execute(
+            select(func.count(Sale.id)).where(*filters)
+        ).scalar()
         
-        query = query.order_by(Sale.date.desc())
+        rows = db.session.execute(
+            select(*SALE_COLUMNS, Product.name.label('product_name'))
+            .outerjoin(Product, Sale.product_id == Product.id)
+            .where(*filters)
+            .order_by(Sale.date.desc())
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).mappings()
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        
-        sales = [sale.to_dict() for sale in pagination.items]
+        sales = []
+        for row in rows:
+            sale = dict(row)
+            sale['date'] = row.date.isoformat() if row.date else None
+            sale['margin'] = round((row.profit / row.revenue) * 100, 2) if row.revenue > 0 else 0
+            sales.append(sale)
         
         return jsonify({
             'sales': sales,
-            'total': pagination.total,
+            'total': total,
             'page': page,
             'per_page': per_page
         })
@@ -257,6 +346,17 @@ def get_sales():
         return jsonify({'error': str(e)}), 400
 
 
+@app.route('/api/sales/stream', methods=['GET'])
+def stream_sales():
+    """Stream every matching sale as a JSON array (bulk export, no pagination)"""
+    try:
+        stmt = select(*SALE_COLUMNS).where(*_row_filters(Sale)).order_by(Sale.date.desc())
+        
+        return Response(stream_with_context(_stream_json_rows(stmt)), mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
 @app.route('/api/sales/summary', methods=['GET'])
 def get_sales_summary():
     """Get sales summary statistics"""
@@ -299,6 +399,21 @@ def get_sales_summary():
         return jsonify({'error': str(e)}), 400
 
 
+# ==================== Competitor Prices API ====================
+
+@app.route('/api/competitor-prices/stream', methods=['GET'])
+def stream_competitor_prices():
+    """Stream every matching competitor price point as a JSON array"""
+    try:
+        stmt = select(*COMPETITOR_PRICE_COLUMNS).where(
+            *_row_filters(CompetitorPrice)
+        ).order_by(CompetitorPrice.date.desc())
+        
+        return Response(stream_with_context(_stream_json_rows(stmt)), mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
 # ==================== Elasticity API ====================
 
 @app.route('/api/elasticity/calculate', methods=['POST'])
@@ -339,9 +454,7 @@ def get_product_elasticity(product_id):
         latest = request.args.get('latest', 'true').lower() == 'true'
         
         if latest:
-            elasticity = ElasticityResult.query.filter_by(
-                product_id=product_id
-            ).order_by(ElasticityResult.calculation_date.desc()).first()
+            elasticity = get_latest_elasticity(product_id)
             
             if not elasticity:
                 return jsonify({'error': 'No elasticity data found'}), 404
@@ -457,12 +570,12 @@ def get_scenarios():
         product_id = request.args.get('product_id', type=int)
         limit = int(request.args.get('limit', 20))
         
-        query = Scenario.query
+        query = Scenario.query.options(joinedload(Scenario.product))
         
         if product_id:
             query = query.filter_by(product_id=product_id)
         
-        scenarios = query.order_by(Scenario.created_at.desc()).limit(limit).all()
+        scenarios = query.order_by(Scenario.created_at.desc(), Scenario.id.desc()).limit(limit).all()
         
         return jsonify({
             'scenarios': [s.to_dict() for s in scenarios]
@@ -537,9 +650,7 @@ def get_recommendations():
         recommendations = []
         
         for product in products:
-            latest_elasticity = ElasticityResult.query.filter_by(
-                product_id=product.id
-            ).order_by(ElasticityResult.calculation_date.desc()).first()
+            latest_elasticity = get_latest_elasticity(product.id)
             
             if latest_elasticity:
                 recommendations.append({
@@ -823,8 +934,12 @@ def export_to_excel():
 # Temporary endpoint to initialize database tables in production
 @app.route('/api/init-db', methods=['POST'])
 def init_db():
+    from database import ensure_column_defaults, ensure_indexes
+    
     with app.app_context():
         db.create_all()
+        ensure_indexes()
+        ensure_column_defaults()
     return jsonify({"status": "ok", "message": "Database tables created."})
 
 if __name__ == '__main__':
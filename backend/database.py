@@ -4,16 +4,110 @@ Database initialization and utility functions
 
 import os
 import sys
+import csv
+import io
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from flask import Flask
-from models import db, Product, Sale, PriceHistory, ElasticityResult, Scenario, CompetitorPrice
+from models import (
+    db, Product, Sale, PriceHistory, ElasticityResult, Scenario, CompetitorPrice,
+    SERVER_DEFAULT_TABLES, fallback_timestamps, utcnow
+)
 from config import SQLALCHEMY_DATABASE_URI, DATABASE_PATH
 import pandas as pd
 from datetime import datetime
+from sqlalchemy import inspect, text
+
+
+# Sales imports larger than this go through PostgreSQL COPY instead of bulk_insert_frame
+COPY_THRESHOLD = 10000
+
+SALE_COPY_COLUMNS = (
+    'product_id', 'date', 'quantity', 'price', 'revenue', 'cost', 'profit',
+    'discount_percent', 'competitor_price', 'season', 'day_of_week',
+    'is_holiday', 'promotion_active'
+)
+
+COMPETITOR_PRICE_COLUMNS = ('product_id', 'competitor_name', 'competitor_price', 'date', 'url')
+
+# Rows per executemany batch for bulk_insert_frame
+BULK_INSERT_CHUNKSIZE = 50000
+
+
+def bulk_copy_sales(engine, rows_iter, columns=SALE_COPY_COLUMNS):
+    """
+    Load sales rows into PostgreSQL with COPY ... FROM STDIN
+    
+    COPY skips SQL parsing per row entirely, so it is reserved for large
+    historical imports; small writes keep using the ORM.
+    
+    Args:
+        engine: SQLAlchemy engine bound to a PostgreSQL (psycopg2) database
+        rows_iter: Iterable of tuples ordered like `columns` (None for NULL)
+        columns: Target column names in the sales table
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows_iter)
+    buffer.seek(0)
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        cursor.copy_expert(
+            f"COPY sales ({', '.join(columns)}) FROM STDIN WITH CSV", buffer
+        )
+        cursor.close()
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+
+def bulk_insert_frame(engine, df, table_name, columns):
+    """
+    Append DataFrame rows to a table in a single transaction
+    
+    Rows go through DataFrame.to_sql in executemany batches instead of one
+    ORM object per row. On SQLite the load also runs with synchronous=OFF
+    and an in-memory journal, restored afterwards; a crash mid-load can then
+    leave a corrupt file, which is acceptable for a reproducible seed import.
+    
+    Args:
+        engine: SQLAlchemy engine
+        df: DataFrame holding at least `columns`
+        table_name: Existing table to append to
+        columns: Column names to insert, matching the table
+    """
+    # to_sql bypasses the ORM, so apply the timestamp fallback here
+    timestamps = fallback_timestamps(db.metadata.tables[table_name])
+    df = df[list(columns)].assign(**timestamps)
+    
+    with engine.connect() as connection:
+        is_sqlite = connection.dialect.name == 'sqlite'
+        
+        if is_sqlite:
+            synchronous = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+            journal_mode = connection.exec_driver_sql('PRAGMA journal_mode').scalar()
+            connection.exec_driver_sql('PRAGMA synchronous=OFF')
+            connection.exec_driver_sql('PRAGMA journal_mode=MEMORY')
+            connection.commit()
+        
+        try:
+            with connection.begin():
+                df.to_sql(
+                    table_name, connection, if_exists='append', index=False,
+                    chunksize=BULK_INSERT_CHUNKSIZE
+                )
+        finally:
+            if is_sqlite:
+                connection.exec_driver_sql(f'PRAGMA journal_mode={journal_mode}')
+                connection.exec_driver_sql(f'PRAGMA synchronous={synchronous}')
+                connection.commit()
 
 
 def init_database(app=None):
@@ -35,6 +129,70 @@ def init_database(app=None):
         return app
 
 
+def ensure_indexes():
+    """
+    Create model-declared indexes that are missing from existing tables
+    
+    db.create_all() only builds indexes together with a new table, so a
+    database created before an index was added to the models never gets it.
+    Must be called inside an app context, after db.create_all().
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def ensure_column_defaults():
+    """
+    Give existing timestamp columns the utcnow() server default the models declare
+    
+    Tables created before the server defaults existed have created_at and
+    updated_at without a DEFAULT, and db.create_all() never alters them.
+    PostgreSQL gets ALTER COLUMN ... SET DEFAULT. SQLite cannot change a
+    column default in place, so such tables keep Python-side timestamps (see
+    models.fallback_timestamps). Tables confirmed to have the default are
+    recorded in SERVER_DEFAULT_TABLES. Must be called inside an app context,
+    after db.create_all().
+    """
+    inspector = inspect(db.engine)
+    
+    for table in db.metadata.sorted_tables:
+        columns = [
+            column for column in table.columns
+            if column.server_default is not None and isinstance(column.server_default.arg, utcnow)
+        ]
+        if not columns:
+            continue
+        
+        reflected = {column['name']: column for column in inspector.get_columns(table.name)}
+        missing = [column for column in columns if not reflected.get(column.name, {}).get('default')]
+        
+        if missing and db.engine.dialect.name == 'postgresql':
+            default_sql = utcnow().compile(dialect=db.engine.dialect)
+            with db.engine.begin() as connection:
+                for column in missing:
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ALTER COLUMN {column.name} SET DEFAULT {default_sql}'
+                    ))
+            missing = []
+        
+        if not missing:
+            SERVER_DEFAULT_TABLES.add(table.name)
+
+
+def _data_file(data_dir, name):
+    """Path of a generated data table, preferring Parquet over CSV"""
+    parquet_file = data_dir / f'{name}.parquet'
+    return parquet_file if parquet_file.exists() else data_dir / f'{name}.csv'
+
+
+def _read_table(path):
+    """Read a generated data table from Parquet or CSV"""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
 def load_data_from_csv(app):
     """Load data from CSV files into database"""
     with app.app_context():
@@ -42,8 +200,8 @@ def load_data_from_csv(app):
         
         # Check if data files exist
         products_file = data_dir / 'products.csv'
-        sales_file = data_dir / 'sales_data.csv'
-        competitors_file = data_dir / 'competitors.csv'
+        sales_file = _data_file(data_dir, 'sales_data')
+        competitors_file = _data_file(data_dir, 'competitors')
         
         if not products_file.exists():
             print("⚠️  Data files not found. Run generate_data.py first.")
@@ -72,61 +230,31 @@ def load_data_from_csv(app):
         # Load sales
         if sales_file.exists():
             print("💰 Loading sales data...")
-            sales_df = pd.read_csv(sales_file)
+            sales_df = _read_table(sales_file)
             
             # Convert date column
             sales_df['date'] = pd.to_datetime(sales_df['date']).dt.date
             
-            batch_size = 1000
-            for i in range(0, len(sales_df), batch_size):
-                batch = sales_df.iloc[i:i+batch_size]
-                
-                for _, row in batch.iterrows():
-                    sale = Sale(
-                        product_id=row['product_id'],
-                        date=row['date'],
-                        quantity=row['quantity'],
-                        price=row['price'],
-                        revenue=row['revenue'],
-                        cost=row['cost'],
-                        profit=row['profit'],
-                        discount_percent=row['discount_percent'],
-                        competitor_price=row['competitor_price'],
-                        season=row['season'],
-                        day_of_week=row['day_of_week'],
-                        is_holiday=row['is_holiday'],
-                        promotion_active=row['promotion_active']
-                    )
-                    db.session.add(sale)
-                
-                db.session.commit()
-                print(f"   Loaded {min(i+batch_size, len(sales_df))}/{len(sales_df)} sales...")
+            if db.engine.dialect.name == 'postgresql' and len(sales_df) > COPY_THRESHOLD:
+                copy_df = sales_df[list(SALE_COPY_COLUMNS)].astype(object)
+                copy_df = copy_df.where(copy_df.notna(), None)
+                bulk_copy_sales(db.engine, copy_df.itertuples(index=False, name=None))
+            else:
+                bulk_insert_frame(db.engine, sales_df, 'sales', SALE_COPY_COLUMNS)
             
             print(f"✓ Loaded {len(sales_df):,} sales transactions")
         
         # Load competitor data
         if competitors_file.exists():
             print("🏪 Loading competitor data...")
-            competitors_df = pd.read_csv(competitors_file)
+            competitors_df = _read_table(competitors_file)
             
             competitors_df['date'] = pd.to_datetime(competitors_df['date']).dt.date
             
-            batch_size = 1000
-            for i in range(0, len(competitors_df), batch_size):
-                batch = competitors_df.iloc[i:i+batch_size]
-                
-                for _, row in batch.iterrows():
-                    comp_price = CompetitorPrice(
-                        product_id=row['product_id'],
-                        competitor_name=row['competitor_name'],
-                        competitor_price=row['competitor_price'],
-                        date=row['date'],
-                        url=row.get('url', '')
-                    )
-                    db.session.add(comp_price)
-                
-                db.session.commit()
-                print(f"   Loaded {min(i+batch_size, len(competitors_df))}/{len(competitors_df)} competitor prices...")
+            if 'url' not in competitors_df:
+                competitors_df['url'] = ''
+            
+            bulk_insert_frame(db.engine, competitors_df, 'competitor_prices', COMPETITOR_PRICE_COLUMNS)
             
             print(f"✓ Loaded {len(competitors_df):,} competitor price points")
         
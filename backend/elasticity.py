@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 from sqlalchemy import func
 from models import db, Product, Sale, ElasticityResult
+from queries import SALES_FRAME_COLUMNS, get_latest_elasticity, get_product_sales
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
@@ -32,14 +33,7 @@ class ElasticityCalculator:
         """
         try:
             # Fetch sales data
-            query = Sale.query.filter_by(product_id=product_id)
-
-            if start_date:
-                query = query.filter(Sale.date >= start_date)
-            if end_date:
-                query = query.filter(Sale.date <= end_date)
-
-            sales_data = query.all()
+            sales_data = get_product_sales(product_id, start_date, end_date)
 
             if len(sales_data) < 10:
                 return {
@@ -48,16 +42,8 @@ class ElasticityCalculator:
                 }
 
             # Prepare data
-            df = pd.DataFrame([{
-                'date': sale.date,
-                'price': sale.price,
-                'quantity': sale.quantity,
-                'revenue': sale.revenue,
-                'discount_percent': sale.discount_percent,
-                'competitor_price': sale.competitor_price,
-                'is_holiday': int(sale.is_holiday),
-                'promotion_active': int(sale.promotion_active)
-            } for sale in sales_data])
+            df = pd.DataFrame.from_records(sales_data, columns=SALES_FRAME_COLUMNS)
+            df[['is_holiday', 'promotion_active']] = df[['is_holiday', 'promotion_active']].astype(int)
 
             # Filter out rows with non-positive price/quantity which break log transforms
             df = df[(df['price'] > 0) & (df['quantity'] > 0)].copy()
@@ -303,9 +289,7 @@ class ElasticityCalculator:
             return {'error': 'Product not found'}
         
         # Get latest elasticity
-        latest_elasticity = ElasticityResult.query.filter_by(
-            product_id=product_id
-        ).order_by(ElasticityResult.calculation_date.desc()).first()
+        latest_elasticity = get_latest_elasticity(product_id)
         
         if not latest_elasticity:
             return {'error': 'No elasticity data available'}
@@ -362,26 +346,27 @@ class ElasticityCalculator:
         Positive = substitutes, Negative = complements
         """
         # Get sales data for both products on same dates
-        dates_p1 = db.session.query(Sale.date).filter_by(product_id=product_id_1).all()
-        dates_p2 = db.session.query(Sale.date).filter_by(product_id=product_id_2).all()
+        # Stream dates straight into sets rather than materializing row lists
+        dates_p1 = {d for (d,) in db.session.query(Sale.date).filter_by(product_id=product_id_1).yield_per(1000)}
+        dates_p2 = {d for (d,) in db.session.query(Sale.date).filter_by(product_id=product_id_2).yield_per(1000)}
         
-        common_dates = set([d[0] for d in dates_p1]).intersection([d[0] for d in dates_p2])
+        common_dates = dates_p1 & dates_p2
         
         if len(common_dates) < 10:
             return {'error': 'Insufficient overlapping data'}
         
-        sales_p1 = Sale.query.filter(
+        sales_p1 = db.session.query(Sale.date, Sale.quantity, Sale.price).filter(
             Sale.product_id == product_id_1,
             Sale.date.in_(common_dates)
         ).order_by(Sale.date).all()
         
-        sales_p2 = Sale.query.filter(
+        sales_p2 = db.session.query(Sale.date, Sale.quantity, Sale.price).filter(
             Sale.product_id == product_id_2,
             Sale.date.in_(common_dates)
         ).order_by(Sale.date).all()
         
-        df1 = pd.DataFrame([{'date': s.date, 'quantity': s.quantity, 'price': s.price} for s in sales_p1])
-        df2 = pd.DataFrame([{'date': s.date, 'quantity': s.quantity, 'price': s.price} for s in sales_p2])
+        df1 = pd.DataFrame.from_records(sales_p1, columns=['date', 'quantity', 'price'])
+        df2 = pd.DataFrame.from_records(sales_p2, columns=['date', 'quantity', 'price'])
         
         df = pd.merge(df1, df2, on='date', suffixes=('_1', '_2'))
         
@@ -432,9 +417,7 @@ def calculate_revenue_optimization(product_id, cost_constraint=None):
         return {'error': 'Product not found'}
     
     # Get elasticity
-    latest_elasticity = ElasticityResult.query.filter_by(
-        product_id=product_id
-    ).order_by(ElasticityResult.calculation_date.desc()).first()
+    latest_elasticity = get_latest_elasticity(product_id)
     
     if not latest_elasticity:
         return {'error': 'Calculate elasticity first'}
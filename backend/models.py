@@ -1,9 +1,54 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
-from sqlalchemy import func, Index
+from datetime import datetime, date
+from sqlalchemy import func, inspect, Index, PrimaryKeyConstraint, event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 
 db = SQLAlchemy()
 
+# Monetary amounts are stored as exact NUMERIC(12, 2) and handed back to Python as
+# floats, so values serialize as-is without per-read rounding.
+Money = db.Numeric(12, 2, asdecimal=False)
+
+
+class utcnow(FunctionElement):
+    """Current UTC timestamp, evaluated by the database (used as a server default)"""
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+# Tables whose live schema is known to carry the utcnow() server default on
+# their timestamp columns; filled in by database.ensure_column_defaults().
+# create_all() never alters existing tables, so until a table is confirmed its
+# rows get Python-side timestamps rather than NULLs.
+SERVER_DEFAULT_TABLES = set()
+
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+
+
+def fallback_timestamps(table):
+    """
+    Python-side timestamp values for inserts into `table`
+    
+    Empty once the table is known to fill created_at/updated_at itself.
+    """
+    if table.name in SERVER_DEFAULT_TABLES:
+        return {}
+    now = datetime.utcnow()
+    return {name: now for name in TIMESTAMP_COLUMNS if name in table.c}
+
+
 class Product(db.Model):
     """Product catalog with pricing information"""
     __tablename__ = 'products'
@@ -14,11 +59,11 @@ class Product(db.Model):
     category = db.Column(db.String(100), nullable=False, index=True)
     subcategory = db.Column(db.String(100))
     brand = db.Column(db.String(100))
-    unit_cost = db.Column(db.Float, nullable=False)
-    current_price = db.Column(db.Float, nullable=False)
+    unit_cost = db.Column(Money, nullable=False)
+    current_price = db.Column(Money, nullable=False)
     currency = db.Column(db.String(3), default='USD')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     sales = db.relationship('Sale', back_populates='product', lazy='dynamic')
@@ -50,25 +95,31 @@ class Sale(db.Model):
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     date = db.Column(db.Date, nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False)
-    price = db.Column(db.Float, nullable=False)
-    revenue = db.Column(db.Float, nullable=False)
-    cost = db.Column(db.Float, nullable=False)
-    profit = db.Column(db.Float, nullable=False)
+    price = db.Column(Money, nullable=False)
+    revenue = db.Column(Money, nullable=False)
+    cost = db.Column(Money, nullable=False)
+    profit = db.Column(Money, nullable=False)
     discount_percent = db.Column(db.Float, default=0)
-    competitor_price = db.Column(db.Float)
+    competitor_price = db.Column(Money)
     season = db.Column(db.String(20))
     day_of_week = db.Column(db.String(10))
     is_holiday = db.Column(db.Boolean, default=False)
     promotion_active = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
     # Relationships
     product = db.relationship('Product', back_populates='sales')
     
-    # Indexes for common queries
+    # Indexes for common queries. On PostgreSQL the table is range-partitioned
+    # by month on `date`, so these become local per-partition indexes.
     __table_args__ = (
         Index('idx_product_date', 'product_id', 'date'),
         Index('idx_date_range', 'date'),
+        Index('idx_product_season', 'product_id', 'season'),
+        {
+            'postgresql_partition_by': 'RANGE (date)',
+            'info': {'partition_key': 'date'}
+        }
     )
     
     def to_dict(self):
@@ -92,18 +143,109 @@ class Sale(db.Model):
         }
 
 
+@compiles(PrimaryKeyConstraint, 'postgresql')
+def _compile_partitioned_primary_key(constraint, compiler, **kw):
+    """PostgreSQL requires a partitioned table's primary key to include the partition key"""
+    ddl = compiler.visit_primary_key_constraint(constraint, **kw)
+    partition_key = constraint.table.info.get('partition_key')
+    if ddl and partition_key and partition_key not in constraint.columns:
+        ddl = f"{ddl[:-1]}, {compiler.preparer.quote(partition_key)})"
+    return ddl
+
+
+def create_sales_partitions(connection, start, end):
+    """Create monthly `sales` partitions covering the months from start up to end (PostgreSQL only)"""
+    month = date(start.year, start.month, 1)
+    while month < end:
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS sales_{month:%Y_%m} PARTITION OF sales "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        ))
+        month = next_month
+
+
+@event.listens_for(Sale.__table__, 'after_create')
+def _create_initial_sales_partitions(target, connection, **kw):
+    """Partition the last three years plus one year ahead; anything else lands in sales_default"""
+    if connection.dialect.name != 'postgresql':
+        return
+    
+    today = date.today()
+    create_sales_partitions(
+        connection,
+        date(today.year - 3, today.month, 1),
+        date(today.year + 1, today.month, 1)
+    )
+    connection.execute(text("CREATE TABLE IF NOT EXISTS sales_default PARTITION OF sales DEFAULT"))
+
+
+def _percent_change(old, new):
+    """Percentage change from old to new, or None when it cannot be derived"""
+    if old is None or new is None or old == 0:
+        return None
+    return (new - old) / old * 100
+
+
+def _required_percent_change(target, derived, old_key, new_key):
+    """
+    _percent_change for a NOT NULL column
+    
+    Raises ValueError rather than returning None, which the flush would only
+    turn into an IntegrityError.
+    """
+    old, new = getattr(target, old_key), getattr(target, new_key)
+    value = _percent_change(old, new)
+    if value is None:
+        raise ValueError(
+            f'{type(target).__name__}.{derived} cannot be derived from '
+            f'{old_key}={old!r} and {new_key}={new!r}; set it explicitly'
+        )
+    return value
+
+
+def _should_derive(target, derived, sources):
+    """
+    Whether a derived column needs (re)computing before the row is flushed
+    
+    New rows fill it only when the caller left it empty. Existing rows also
+    recompute it when any of its source columns changed, unless the caller
+    set the derived value in the same change.
+    """
+    if getattr(target, derived) is None:
+        return True
+    
+    state = inspect(target)
+    if not state.persistent:
+        return False
+    
+    attrs = state.attrs
+    return (any(attrs[name].history.has_changes() for name in sources)
+            and not attrs[derived].history.has_changes())
+
+
+@event.listens_for(Sale, 'before_insert')
+@event.listens_for(Sale, 'before_update')
+def _derive_sale_totals(mapper, connection, target):
+    """Derive revenue and profit from price, quantity and cost when omitted or stale"""
+    if _should_derive(target, 'revenue', ('price', 'quantity')):
+        target.revenue = target.price * target.quantity
+    if _should_derive(target, 'profit', ('revenue', 'cost')):
+        target.profit = target.revenue - target.cost
+
+
 class PriceHistory(db.Model):
     """Price change tracking"""
     __tablename__ = 'price_history'
     
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
-    old_price = db.Column(db.Float, nullable=False)
-    new_price = db.Column(db.Float, nullable=False)
+    old_price = db.Column(Money, nullable=False)
+    new_price = db.Column(Money, nullable=False)
     change_percent = db.Column(db.Float, nullable=False)
     effective_date = db.Column(db.Date, nullable=False, index=True)
     reason = db.Column(db.String(200))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     created_by = db.Column(db.String(100))
     
     # Relationships
@@ -124,6 +266,20 @@ class PriceHistory(db.Model):
         }
 
 
+@event.listens_for(PriceHistory, 'before_insert')
+@event.listens_for(PriceHistory, 'before_update')
+def _derive_price_change(mapper, connection, target):
+    """
+    Derive change_percent from the old and new price when omitted or stale
+    
+    Raises ValueError when it must be derived but old_price is zero or missing.
+    """
+    if _should_derive(target, 'change_percent', ('old_price', 'new_price')):
+        target.change_percent = _required_percent_change(
+            target, 'change_percent', 'old_price', 'new_price'
+        )
+
+
 class ElasticityResult(db.Model):
     """Calculated price elasticity results"""
     __tablename__ = 'elasticity_results'
@@ -143,12 +299,17 @@ class ElasticityResult(db.Model):
     
     # Recommendations based on elasticity
     recommended_action = db.Column(db.String(100))
-    optimal_price = db.Column(db.Float)
+    optimal_price = db.Column(Money)
     expected_revenue_change = db.Column(db.Float)
     
     # Relationships
     product = db.relationship('Product', back_populates='elasticity_results')
     
+    # Serves "latest result per product" lookups without a sort
+    __table_args__ = (
+        Index('ix_er_pid_calcdate', 'product_id', calculation_date.desc()),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -184,8 +345,8 @@ class Scenario(db.Model):
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), index=True)
     
     # Scenario parameters
-    current_price = db.Column(db.Float, nullable=False)
-    new_price = db.Column(db.Float, nullable=False)
+    current_price = db.Column(Money, nullable=False)
+    new_price = db.Column(Money, nullable=False)
     price_change_percent = db.Column(db.Float, nullable=False)
     
     # Predictions
@@ -204,7 +365,7 @@ class Scenario(db.Model):
     # Metadata
     simulation_days = db.Column(db.Integer, default=30)
     elasticity_used = db.Column(db.Float)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     
     # Relationships
     product = db.relationship('Product')
@@ -282,6 +443,28 @@ class Scenario(db.Model):
         }
 
 
+@event.listens_for(Scenario, 'before_insert')
+@event.listens_for(Scenario, 'before_update')
+def _derive_scenario_changes(mapper, connection, target):
+    """
+    Derive the *_change_percent columns from current/predicted values when omitted or stale
+    
+    The nullable demand/revenue/profit changes stay None when they cannot be
+    derived; price_change_percent is required, so a zero or missing
+    current_price raises ValueError instead.
+    """
+    if _should_derive(target, 'price_change_percent', ('current_price', 'new_price')):
+        target.price_change_percent = _required_percent_change(
+            target, 'price_change_percent', 'current_price', 'new_price'
+        )
+    if _should_derive(target, 'demand_change_percent', ('current_demand', 'predicted_demand')):
+        target.demand_change_percent = _percent_change(target.current_demand, target.predicted_demand)
+    if _should_derive(target, 'revenue_change_percent', ('current_revenue', 'predicted_revenue')):
+        target.revenue_change_percent = _percent_change(target.current_revenue, target.predicted_revenue)
+    if _should_derive(target, 'profit_change_percent', ('current_profit', 'predicted_profit')):
+        target.profit_change_percent = _percent_change(target.current_profit, target.predicted_profit)
+
+
 class CompetitorPrice(db.Model):
     """Competitor pricing data"""
     __tablename__ = 'competitor_prices'
@@ -289,10 +472,10 @@ class CompetitorPrice(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, index=True)
     competitor_name = db.Column(db.String(100), nullable=False)
-    competitor_price = db.Column(db.Float, nullable=False)
+    competitor_price = db.Column(Money, nullable=False)
     date = db.Column(db.Date, nullable=False, index=True)
     url = db.Column(db.String(500))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
     # Relationships
     product = db.relationship('Product')
@@ -310,3 +493,14 @@ class CompetitorPrice(db.Model):
             'date': self.date.isoformat() if self.date else None,
             'url': self.url
         }
+
+
+def _fill_fallback_timestamps(mapper, connection, target):
+    """Set created_at/updated_at in Python while the table's server default is unconfirmed"""
+    for key, value in fallback_timestamps(mapper.local_table).items():
+        if getattr(target, key) is None:
+            setattr(target, key, value)
+
+
+for _model in (Product, Sale, PriceHistory, Scenario, CompetitorPrice):
+    event.listen(_model, 'before_insert', _fill_fallback_timestamps)
@@ -0,0 +1,79 @@
+"""
+Frequently executed lookups, built once as lambda statements.
+
+SQLAlchemy caches the compiled SQL of a lambda_stmt by the lambda's code
+location, so the API routes and simulators reuse one compiled statement
+instead of rebuilding and re-compiling a select() on every request.
+"""
+
+from datetime import date
+from sqlalchemy import select, bindparam, func, lambda_stmt
+from models import db, Sale, ElasticityResult
+
+
+_latest_elasticity_stmt = lambda_stmt(
+    lambda: select(ElasticityResult)
+    .where(ElasticityResult.product_id == bindparam('product_id'))
+    .order_by(ElasticityResult.calculation_date.desc())
+    .limit(1)
+)
+
+# Latest ElasticityResult per product for a list of product ids, ranked with a
+# window function so one statement serves any number of products
+_ranked_elasticities = select(
+    ElasticityResult.id,
+    func.row_number().over(
+        partition_by=ElasticityResult.product_id,
+        order_by=ElasticityResult.calculation_date.desc()
+    ).label('rank')
+).where(
+    ElasticityResult.product_id.in_(bindparam('product_ids', expanding=True))
+).subquery()
+
+_latest_elasticities_stmt = select(ElasticityResult).join(
+    _ranked_elasticities, ElasticityResult.id == _ranked_elasticities.c.id
+).where(_ranked_elasticities.c.rank == 1)
+
+# Sale columns the elasticity models work from, in DataFrame column order
+SALES_FRAME_COLUMNS = (
+    'date', 'price', 'quantity', 'revenue', 'discount_percent',
+    'competitor_price', 'is_holiday', 'promotion_active'
+)
+
+_product_sales_stmt = lambda_stmt(
+    lambda: select(
+        Sale.date, Sale.price, Sale.quantity, Sale.revenue, Sale.discount_percent,
+        Sale.competitor_price, Sale.is_holiday, Sale.promotion_active
+    )
+    .where(Sale.product_id == bindparam('product_id'))
+    .where(Sale.date.between(bindparam('start_date'), bindparam('end_date')))
+)
+
+
+def get_latest_elasticity(product_id):
+    """Most recent ElasticityResult for a product, or None"""
+    return db.session.execute(
+        _latest_elasticity_stmt, {'product_id': product_id}
+    ).scalars().first()
+
+
+def get_latest_elasticities(product_ids):
+    """Most recent ElasticityResult for each product, keyed by product id"""
+    latest = db.session.execute(
+        _latest_elasticities_stmt, {'product_ids': list(product_ids)}
+    ).scalars()
+    return {e.product_id: e for e in latest}
+
+
+def get_product_sales(product_id, start_date=None, end_date=None):
+    """
+    Sales rows for a product, optionally bounded by an inclusive date range
+    
+    Rows are plain tuples in SALES_FRAME_COLUMNS order, ready for
+    DataFrame.from_records without hydrating Sale objects.
+    """
+    return db.session.execute(_product_sales_stmt, {
+        'product_id': product_id,
+        'start_date': start_date or date.min,
+        'end_date': end_date or date.max
+    }).all()
@@ -1,8 +1,348 @@
+import time
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-from models import db, Product, Sale, Scenario, ElasticityResult
-from sqlalchemy import func
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+from models import db, Product, Sale, Scenario, ElasticityResult, fallback_timestamps
+from queries import get_latest_elasticity, get_latest_elasticities
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import joinedload
+
+try:
+    import numexpr
+except ImportError:  # optional; the grid projection falls back to plain NumPy
+    numexpr = None
+
+
+# Days of sales history averaged into a scenario baseline
+BASELINE_WINDOW_DAYS = 90
+
+# Precision of the bulk projection grid. float32 would halve memory traffic, but
+# its ~7 significant digits cannot hold cent-rounded 30-day revenue totals in
+# the millions, so bulk results would drift from single simulations.
+GRID_DTYPE = np.float64
+
+# Cached baselines expire after this many seconds even without a local write,
+# so changes made by other worker processes are picked up
+BASELINE_CACHE_TTL = 60
+
+# Everything simulate_scenario needs from the database for one product. Field
+# names mirror ElasticityResult so the tuple can stand in for it.
+ProductBaseline = namedtuple('ProductBaseline', [
+    'product_id', 'product_name', 'current_price', 'unit_cost',
+    'elasticity_coefficient', 'elasticity_type',
+    'confidence_interval_lower', 'confidence_interval_upper',
+    'avg_quantity', 'avg_revenue', 'avg_profit', 'sales_count'
+])
+
+# Output of the shared projection kernel, field order matches _build_result
+Projection = namedtuple('Projection', [
+    'quantity_change_percent', 'predicted_quantity', 'predicted_revenue',
+    'predicted_profit', 'revenue_change_percent', 'profit_change_percent'
+])
+
+# Bumped on any local write to the tables a baseline is built from
+_baseline_version = 0
+
+
+def _invalidate_baselines(mapper, connection, target):
+    global _baseline_version
+    _baseline_version += 1
+
+
+for _model in (Product, Sale, ElasticityResult):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _invalidate_baselines)
+
+
+def get_product_baseline(product_id, date_threshold):
+    """
+    Product pricing, latest elasticity and sales averages since date_threshold
+    
+    Returns a ProductBaseline, or an error message string. Results are
+    memoized until the next local write or the TTL expires.
+    """
+    ttl_bucket = int(time.monotonic() // BASELINE_CACHE_TTL)
+    return _load_product_baseline(product_id, date_threshold, _baseline_version, ttl_bucket)
+
+
+@lru_cache(maxsize=512)
+def _load_product_baseline(product_id, date_threshold, version, ttl_bucket):
+    product = Product.query.get(product_id)
+    if not product:
+        return 'Product not found'
+    
+    # Get latest elasticity
+    elasticity_result = get_latest_elasticity(product_id)
+    
+    if not elasticity_result:
+        return 'No elasticity data available. Calculate elasticity first.'
+    
+    history = db.session.query(
+        func.avg(Sale.quantity).label('avg_quantity'),
+        func.avg(Sale.revenue).label('avg_revenue'),
+        func.avg(Sale.profit).label('avg_profit'),
+        func.count(Sale.id).label('sales_count')
+    ).filter(
+        Sale.product_id == product_id,
+        Sale.date >= date_threshold
+    ).one()
+    
+    return _make_baseline(product, elasticity_result, history)
+
+
+def _make_baseline(product, elasticity_result, history):
+    """Build a ProductBaseline from a product, its latest elasticity and a sales-averages row"""
+    # AVG(integer) comes back as Decimal on PostgreSQL
+    return ProductBaseline(
+        product_id=product.id,
+        product_name=product.name,
+        current_price=product.current_price,
+        unit_cost=product.unit_cost,
+        elasticity_coefficient=elasticity_result.elasticity_coefficient,
+        elasticity_type=elasticity_result.elasticity_type,
+        confidence_interval_lower=elasticity_result.confidence_interval_lower,
+        confidence_interval_upper=elasticity_result.confidence_interval_upper,
+        avg_quantity=float(history.avg_quantity or 0) if history else 0.0,
+        avg_revenue=float(history.avg_revenue or 0) if history else 0.0,
+        avg_profit=float(history.avg_profit or 0) if history else 0.0,
+        sales_count=history.sales_count if history else 0
+    )
+
+
+def _load_bulk_baselines(product_ids, date_threshold):
+    """
+    Baselines for many products with one query per table
+    
+    Returns:
+        dict: {product_id: ProductBaseline} for products that exist and have
+        an elasticity result
+    """
+    products = Product.query.filter(Product.id.in_(product_ids)).all()
+    
+    elasticities = get_latest_elasticities(product_ids)
+    
+    histories = {
+        row.product_id: row
+        for row in db.session.query(
+            Sale.product_id,
+            func.avg(Sale.quantity).label('avg_quantity'),
+            func.avg(Sale.revenue).label('avg_revenue'),
+            func.avg(Sale.profit).label('avg_profit'),
+            func.count(Sale.id).label('sales_count')
+        ).filter(
+            Sale.product_id.in_(product_ids),
+            Sale.date >= date_threshold
+        ).group_by(Sale.product_id)
+    }
+    
+    return {
+        product.id: _make_baseline(product, elasticities[product.id], histories.get(product.id))
+        for product in products
+        if product.id in elasticities
+    }
+
+
+@lru_cache(maxsize=4096)
+def _confidence_bounds(el_lower, el_upper, current_qty, current_price, new_price):
+    """
+    Rounded (qty_lower, qty_upper, revenue_lower, revenue_upper) for a price move
+    
+    Pure in its float arguments, so repeat simulations of the same product and
+    price reuse the result.
+    """
+    price_change = (new_price - current_price) / current_price
+    
+    # Lower bound (pessimistic)
+    qty_change_lower = el_lower * price_change
+    qty_lower = current_qty * (1 + qty_change_lower)
+    revenue_lower = new_price * qty_lower
+    
+    # Upper bound (optimistic)
+    qty_change_upper = el_upper * price_change
+    qty_upper = current_qty * (1 + qty_change_upper)
+    revenue_upper = new_price * qty_upper
+    
+    return (
+        round(qty_lower, 1),
+        round(qty_upper, 1),
+        round(revenue_lower, 2),
+        round(revenue_upper, 2)
+    )
+
+
+def _project(price_change_percent, new_price, unit_cost, elasticity,
+             avg_quantity, avg_revenue, avg_profit, demand_multiplier=1.0):
+    """
+    Core elasticity arithmetic shared by single and grid simulations
+    
+    Works element-wise on Python floats or broadcastable NumPy arrays.
+    demand_multiplier scales demand for effects outside the price change,
+    such as seasonality.
+    
+    Returns:
+        Projection: Daily demand, revenue and profit projections
+    """
+    # % change in quantity = elasticity * % change in price
+    quantity_change_percent = elasticity * (price_change_percent / 100) * 100
+    
+    if demand_multiplier != 1.0:
+        quantity_change_percent = ((1 + quantity_change_percent / 100) * demand_multiplier - 1) * 100
+    
+    predicted_quantity = avg_quantity * (1 + quantity_change_percent / 100)
+    predicted_revenue = new_price * predicted_quantity
+    predicted_profit = (new_price - unit_cost) * predicted_quantity
+    
+    return Projection(
+        quantity_change_percent=quantity_change_percent,
+        predicted_quantity=predicted_quantity,
+        predicted_revenue=predicted_revenue,
+        predicted_profit=predicted_profit,
+        revenue_change_percent=((predicted_revenue - avg_revenue) / avg_revenue) * 100,
+        profit_change_percent=((predicted_profit - avg_profit) / avg_profit) * 100
+    )
+
+
+def _project_numexpr(price_change_percent, new_price, unit_cost, elasticity,
+                     avg_quantity, avg_revenue, avg_profit):
+    """
+    _project for large NumPy grids, evaluated by numexpr
+    
+    Each field is one fused expression, so the chained arithmetic does not
+    allocate a temporary array per operation.
+    """
+    quantity_change_percent = numexpr.evaluate('elasticity * (price_change_percent / 100) * 100')
+    predicted_quantity = numexpr.evaluate('avg_quantity * (1 + quantity_change_percent / 100)')
+    predicted_revenue = numexpr.evaluate('new_price * predicted_quantity')
+    predicted_profit = numexpr.evaluate('(new_price - unit_cost) * predicted_quantity')
+    
+    return Projection(
+        quantity_change_percent=quantity_change_percent,
+        predicted_quantity=predicted_quantity,
+        predicted_revenue=predicted_revenue,
+        predicted_profit=predicted_profit,
+        revenue_change_percent=numexpr.evaluate('((predicted_revenue - avg_revenue) / avg_revenue) * 100'),
+        profit_change_percent=numexpr.evaluate('((predicted_profit - avg_profit) / avg_profit) * 100')
+    )
+
+
+def _project_grid(baselines, price_changes):
+    """
+    Elasticity projection for every (product, price change) pair at once
+    
+    Args:
+        baselines: Sequence of K ProductBaseline
+        price_changes: Sequence of P price change percentages
+        
+    Returns:
+        dict: Arrays of shape (K, P) keyed by result field
+    """
+    current_price = np.array([b.current_price for b in baselines], dtype=GRID_DTYPE)[:, None]
+    unit_cost = np.array([b.unit_cost for b in baselines], dtype=GRID_DTYPE)[:, None]
+    elasticity = np.array([b.elasticity_coefficient for b in baselines], dtype=GRID_DTYPE)[:, None]
+    avg_quantity = np.array([b.avg_quantity for b in baselines], dtype=GRID_DTYPE)[:, None]
+    avg_revenue = np.array([b.avg_revenue for b in baselines], dtype=GRID_DTYPE)[:, None]
+    avg_profit = np.array([b.avg_profit for b in baselines], dtype=GRID_DTYPE)[:, None]
+    
+    new_price = current_price * (1 + np.asarray(price_changes, dtype=GRID_DTYPE)[None, :] / 100)
+    price_change_percent = ((new_price - current_price) / current_price) * 100
+    
+    project = _project_numexpr if numexpr is not None else _project
+    projection = project(
+        price_change_percent, new_price, unit_cost, elasticity,
+        avg_quantity, avg_revenue, avg_profit
+    )
+    
+    return {
+        'new_price': new_price,
+        'price_change_percent': price_change_percent,
+        **projection._asdict()
+    }
+
+
+# Batched scenario insert; rows come back in parameter order so ids can be
+# matched to their results
+_insert_scenarios_stmt = insert(Scenario).returning(Scenario.id, sort_by_parameter_order=True)
+
+# Decimal places for each rounded field of a scenario result, by section
+RESULT_PRECISION = {
+    'pricing': {
+        'price_change_percent': 2
+    },
+    'demand': {
+        'current_daily_quantity': 1,
+        'predicted_daily_quantity': 1,
+        'quantity_change_percent': 2,
+        'total_current_volume': 0,
+        'total_predicted_volume': 0
+    },
+    'revenue': {
+        'current_daily_revenue': 2,
+        'predicted_daily_revenue': 2,
+        'revenue_change_percent': 2,
+        'total_current_revenue': 2,
+        'total_predicted_revenue': 2,
+        'total_revenue_change': 2
+    },
+    'profit': {
+        'current_daily_profit': 2,
+        'predicted_daily_profit': 2,
+        'profit_change_percent': 2,
+        'total_current_profit': 2,
+        'total_predicted_profit': 2,
+        'total_profit_change': 2
+    },
+    'margins': {
+        'current_margin_percent': 2,
+        'predicted_margin_percent': 2
+    }
+}
+
+
+_HIGHLY_RECOMMENDED = {
+    'action': 'Highly Recommended',
+    'reason': 'Both revenue and profit increase significantly',
+    'risk_level': 'Low'
+}
+_RECOMMENDED = {
+    'action': 'Recommended',
+    'reason': 'Positive impact on revenue and profit',
+    'risk_level': 'Low'
+}
+_CONSIDER = {
+    'action': 'Consider',
+    'reason': 'Profit increases but revenue decreases (volume play)',
+    'risk_level': 'Medium'
+}
+_CAUTION = {
+    'action': 'Caution',
+    'reason': 'Slight profit decrease, monitor closely',
+    'risk_level': 'Medium'
+}
+_NOT_RECOMMENDED = {
+    'action': 'Not Recommended',
+    'reason': 'Negative impact on profitability',
+    'risk_level': 'High'
+}
+
+# Recommendation by [revenue bucket][profit bucket]. Revenue change buckets are
+# zero (or NaN), (0, 5], > 5, < 0; profit change buckets are <= -5 (or NaN),
+# (-5, 0], (0, 5], > 5.
+_RECOMMENDATION_TABLE = (
+    (_NOT_RECOMMENDED, _NOT_RECOMMENDED, _NOT_RECOMMENDED, _NOT_RECOMMENDED),
+    (_NOT_RECOMMENDED, _NOT_RECOMMENDED, _RECOMMENDED, _RECOMMENDED),
+    (_NOT_RECOMMENDED, _NOT_RECOMMENDED, _RECOMMENDED, _HIGHLY_RECOMMENDED),
+    (_NOT_RECOMMENDED, _CAUTION, _CONSIDER, _CONSIDER)
+)
+
+
+def _round_result(result):
+    """Round a scenario result in place per RESULT_PRECISION and return it"""
+    for section, fields in RESULT_PRECISION.items():
+        values = result[section]
+        for key, ndigits in fields.items():
+            values[key] = round(values[key], ndigits)
+    return result
 
 
 class ScenarioSimulator:
@@ -11,7 +351,8 @@ class ScenarioSimulator:
     def __init__(self):
         self.confidence_level = 0.95
     
-    def simulate_scenario(self, product_id, new_price, simulation_days=30, scenario_name=None):
+    def simulate_scenario(self, product_id, new_price, simulation_days=30, scenario_name=None, as_of=None,
+                          demand_multiplier=1.0):
         """
         Simulate impact of price change on demand, revenue, and profit
         
@@ -20,25 +361,29 @@ class ScenarioSimulator:
             new_price: Proposed new price
             simulation_days: Number of days to simulate
             scenario_name: Optional name for the scenario
+            as_of: Date the sales history window ends on (defaults to today)
+            demand_multiplier: Factor applied to predicted demand, e.g. seasonality
             
         Returns:
             dict: Simulation results
         """
-        product = Product.query.get(product_id)
-        if not product:
-            return {'error': 'Product not found'}
-        
-        # Get latest elasticity
-        elasticity_result = ElasticityResult.query.filter_by(
-            product_id=product_id
-        ).order_by(ElasticityResult.calculation_date.desc()).first()
+        baseline = self._get_baseline(product_id, as_of)
+        if isinstance(baseline, str):
+            return {'error': baseline}
         
-        if not elasticity_result:
-            return {'error': 'No elasticity data available. Calculate elasticity first.'}
-        
-        elasticity = elasticity_result.elasticity_coefficient
-        current_price = product.current_price
-        unit_cost = product.unit_cost
+        return self._simulate_with_baseline(baseline, new_price, simulation_days, scenario_name, demand_multiplier)
+    
+    def _get_baseline(self, product_id, as_of=None):
+        """Baseline over the standard history window, or an error message string"""
+        date_threshold = (as_of or date.today()) - timedelta(days=BASELINE_WINDOW_DAYS)
+        return get_product_baseline(product_id, date_threshold)
+    
+    def _simulate_with_baseline(self, baseline, new_price, simulation_days=30, scenario_name=None,
+                                demand_multiplier=1.0):
+        """simulate_scenario for a baseline the caller has already loaded"""
+        elasticity = baseline.elasticity_coefficient
+        current_price = baseline.current_price
+        unit_cost = baseline.unit_cost
         
         # Calculate price change
         price_change_percent = ((new_price - current_price) / current_price) * 100
@@ -49,39 +394,41 @@ class ScenarioSimulator:
         if price_change_percent > 20:
             return {'error': 'Price increase exceeds 20% limit'}
         
-        # Get historical averages
-        date_threshold = datetime.now().date() - timedelta(days=90)
-        
-        historical_sales = Sale.query.filter(
-            Sale.product_id == product_id,
-            Sale.date >= date_threshold
-        ).all()
-        
-        if len(historical_sales) < 10:
+        if baseline.sales_count < 10:
             return {'error': 'Insufficient historical data'}
         
-        df = pd.DataFrame([{
-            'quantity': sale.quantity,
-            'revenue': sale.revenue,
-            'profit': sale.profit,
-            'price': sale.price
-        } for sale in historical_sales])
+        # Calculate predicted values using elasticity
+        projection = _project(
+            price_change_percent, new_price, unit_cost, elasticity,
+            baseline.avg_quantity, baseline.avg_revenue, baseline.avg_profit,
+            demand_multiplier
+        )
         
-        current_avg_quantity = df['quantity'].mean()
-        current_avg_revenue = df['revenue'].mean()
-        current_avg_profit = df['profit'].mean()
+        # Generate scenario name if not provided
+        if not scenario_name:
+            direction = "Increase" if price_change_percent > 0 else "Decrease"
+            scenario_name = f"Price {direction} {abs(price_change_percent):.1f}% - {simulation_days} days"
         
-        # Calculate predicted values using elasticity
-        # % change in quantity = elasticity * % change in price
-        quantity_change_percent = elasticity * (price_change_percent / 100) * 100
+        result = self._build_result(
+            scenario_name, baseline, new_price, simulation_days,
+            price_change_percent, *projection, demand_multiplier=demand_multiplier
+        )
         
-        predicted_quantity = current_avg_quantity * (1 + quantity_change_percent / 100)
-        predicted_revenue = new_price * predicted_quantity
-        predicted_profit = (new_price - unit_cost) * predicted_quantity
+        # Save scenario to database
+        self._save_scenario(result, elasticity)
         
-        # Calculate changes
-        revenue_change_percent = ((predicted_revenue - current_avg_revenue) / current_avg_revenue) * 100
-        profit_change_percent = ((predicted_profit - current_avg_profit) / current_avg_profit) * 100
+        return result
+    
+    def _build_result(self, scenario_name, baseline, new_price, simulation_days,
+                      price_change_percent, quantity_change_percent, predicted_quantity,
+                      predicted_revenue, predicted_profit, revenue_change_percent, profit_change_percent,
+                      demand_multiplier=1.0):
+        """Assemble the scenario response from projected daily values"""
+        current_price = baseline.current_price
+        unit_cost = baseline.unit_cost
+        current_avg_quantity = baseline.avg_quantity
+        current_avg_revenue = baseline.avg_revenue
+        current_avg_profit = baseline.avg_profit
         
         # Project over simulation period
         total_current_revenue = current_avg_revenue * simulation_days
@@ -92,55 +439,50 @@ class ScenarioSimulator:
         
         # Calculate confidence intervals
         confidence_intervals = self._calculate_confidence_intervals(
-            elasticity_result, current_avg_quantity, current_price, new_price
+            baseline, current_avg_quantity * demand_multiplier, current_price, new_price
         )
         
-        # Generate scenario name if not provided
-        if not scenario_name:
-            direction = "Increase" if price_change_percent > 0 else "Decrease"
-            scenario_name = f"Price {direction} {abs(price_change_percent):.1f}% - {simulation_days} days"
-        
         result = {
             'scenario_name': scenario_name,
-            'product_id': product_id,
-            'product_name': product.name,
+            'product_id': baseline.product_id,
+            'product_name': baseline.product_name,
             'simulation_days': simulation_days,
             'pricing': {
                 'current_price': current_price,
                 'new_price': new_price,
                 'price_change': new_price - current_price,
-                'price_change_percent': round(price_change_percent, 2)
+                'price_change_percent': price_change_percent
             },
             'demand': {
-                'current_daily_quantity': round(current_avg_quantity, 1),
-                'predicted_daily_quantity': round(predicted_quantity, 1),
-                'quantity_change_percent': round(quantity_change_percent, 2),
-                'total_current_volume': round(current_avg_quantity * simulation_days, 0),
-                'total_predicted_volume': round(predicted_quantity * simulation_days, 0)
+                'current_daily_quantity': current_avg_quantity,
+                'predicted_daily_quantity': predicted_quantity,
+                'quantity_change_percent': quantity_change_percent,
+                'total_current_volume': current_avg_quantity * simulation_days,
+                'total_predicted_volume': predicted_quantity * simulation_days
             },
             'revenue': {
-                'current_daily_revenue': round(current_avg_revenue, 2),
-                'predicted_daily_revenue': round(predicted_revenue, 2),
-                'revenue_change_percent': round(revenue_change_percent, 2),
-                'total_current_revenue': round(total_current_revenue, 2),
-                'total_predicted_revenue': round(total_predicted_revenue, 2),
-                'total_revenue_change': round(total_predicted_revenue - total_current_revenue, 2)
+                'current_daily_revenue': current_avg_revenue,
+                'predicted_daily_revenue': predicted_revenue,
+                'revenue_change_percent': revenue_change_percent,
+                'total_current_revenue': total_current_revenue,
+                'total_predicted_revenue': total_predicted_revenue,
+                'total_revenue_change': total_predicted_revenue - total_current_revenue
             },
             'profit': {
-                'current_daily_profit': round(current_avg_profit, 2),
-                'predicted_daily_profit': round(predicted_profit, 2),
-                'profit_change_percent': round(profit_change_percent, 2),
-                'total_current_profit': round(total_current_profit, 2),
-                'total_predicted_profit': round(total_predicted_profit, 2),
-                'total_profit_change': round(total_predicted_profit - total_current_profit, 2)
+                'current_daily_profit': current_avg_profit,
+                'predicted_daily_profit': predicted_profit,
+                'profit_change_percent': profit_change_percent,
+                'total_current_profit': total_current_profit,
+                'total_predicted_profit': total_predicted_profit,
+                'total_profit_change': total_predicted_profit - total_current_profit
             },
             'margins': {
-                'current_margin_percent': round(((current_price - unit_cost) / current_price) * 100, 2),
-                'predicted_margin_percent': round(((new_price - unit_cost) / new_price) * 100, 2)
+                'current_margin_percent': ((current_price - unit_cost) / current_price) * 100,
+                'predicted_margin_percent': ((new_price - unit_cost) / new_price) * 100
             },
             'elasticity': {
-                'coefficient': elasticity,
-                'type': elasticity_result.elasticity_type,
+                'coefficient': baseline.elasticity_coefficient,
+                'type': baseline.elasticity_type,
                 'confidence_interval': confidence_intervals
             },
             'recommendation': self._generate_recommendation(
@@ -148,10 +490,7 @@ class ScenarioSimulator:
             )
         }
         
-        # Save scenario to database
-        self._save_scenario(result, elasticity)
-        
-        return result
+        return _round_result(result)
     
     def _calculate_confidence_intervals(self, elasticity_result, current_qty, current_price, new_price):
         """Calculate confidence intervals for predictions"""
@@ -159,84 +498,54 @@ class ScenarioSimulator:
         el_lower = elasticity_result.confidence_interval_lower or elasticity * 0.8
         el_upper = elasticity_result.confidence_interval_upper or elasticity * 1.2
         
-        price_change = (new_price - current_price) / current_price
-        
-        # Lower bound (pessimistic)
-        qty_change_lower = el_lower * price_change
-        qty_lower = current_qty * (1 + qty_change_lower)
-        revenue_lower = new_price * qty_lower
-        
-        # Upper bound (optimistic)
-        qty_change_upper = el_upper * price_change
-        qty_upper = current_qty * (1 + qty_change_upper)
-        revenue_upper = new_price * qty_upper
+        qty_lower, qty_upper, revenue_lower, revenue_upper = _confidence_bounds(
+            el_lower, el_upper, current_qty, current_price, new_price
+        )
         
         return {
             'quantity': {
-                'lower': round(qty_lower, 1),
-                'upper': round(qty_upper, 1)
+                'lower': qty_lower,
+                'upper': qty_upper
             },
             'revenue': {
-                'lower': round(revenue_lower, 2),
-                'upper': round(revenue_upper, 2)
+                'lower': revenue_lower,
+                'upper': revenue_upper
             }
         }
     
     def _generate_recommendation(self, price_change, revenue_change, profit_change):
         """Generate recommendation based on simulation results"""
-        if revenue_change > 5 and profit_change > 5:
-            return {
-                'action': 'Highly Recommended',
-                'reason': 'Both revenue and profit increase significantly',
-                'risk_level': 'Low'
-            }
-        elif revenue_change > 0 and profit_change > 0:
-            return {
-                'action': 'Recommended',
-                'reason': 'Positive impact on revenue and profit',
-                'risk_level': 'Low'
-            }
-        elif profit_change > 0 and revenue_change < 0:
-            return {
-                'action': 'Consider',
-                'reason': 'Profit increases but revenue decreases (volume play)',
-                'risk_level': 'Medium'
-            }
-        elif profit_change > -5 and revenue_change < 0:
-            return {
-                'action': 'Caution',
-                'reason': 'Slight profit decrease, monitor closely',
-                'risk_level': 'Medium'
-            }
-        else:
-            return {
-                'action': 'Not Recommended',
-                'reason': 'Negative impact on profitability',
-                'risk_level': 'High'
-            }
+        revenue_bucket = int(revenue_change > 0) + int(revenue_change > 5) + 3 * int(revenue_change < 0)
+        profit_bucket = int(profit_change > -5) + int(profit_change > 0) + int(profit_change > 5)
+        
+        return dict(_RECOMMENDATION_TABLE[revenue_bucket][profit_bucket])
+    
+    def _scenario_row(self, result, elasticity):
+        """Scenario column values for a simulation result"""
+        return {
+            'name': result['scenario_name'],
+            'description': f"Simulation of {result['pricing']['price_change_percent']}% price change",
+            'product_id': result['product_id'],
+            'current_price': result['pricing']['current_price'],
+            'new_price': result['pricing']['new_price'],
+            'price_change_percent': result['pricing']['price_change_percent'],
+            'current_demand': result['demand']['current_daily_quantity'],
+            'predicted_demand': result['demand']['predicted_daily_quantity'],
+            'demand_change_percent': result['demand']['quantity_change_percent'],
+            'current_revenue': result['revenue']['current_daily_revenue'],
+            'predicted_revenue': result['revenue']['predicted_daily_revenue'],
+            'revenue_change_percent': result['revenue']['revenue_change_percent'],
+            'current_profit': result['profit']['current_daily_profit'],
+            'predicted_profit': result['profit']['predicted_daily_profit'],
+            'profit_change_percent': result['profit']['profit_change_percent'],
+            'simulation_days': result['simulation_days'],
+            'elasticity_used': elasticity
+        }
     
     def _save_scenario(self, result, elasticity):
         """Save scenario to database"""
         try:
-            scenario = Scenario(
-                name=result['scenario_name'],
-                description=f"Simulation of {result['pricing']['price_change_percent']}% price change",
-                product_id=result['product_id'],
-                current_price=result['pricing']['current_price'],
-                new_price=result['pricing']['new_price'],
-                price_change_percent=result['pricing']['price_change_percent'],
-                current_demand=result['demand']['current_daily_quantity'],
-                predicted_demand=result['demand']['predicted_daily_quantity'],
-                demand_change_percent=result['demand']['quantity_change_percent'],
-                current_revenue=result['revenue']['current_daily_revenue'],
-                predicted_revenue=result['revenue']['predicted_daily_revenue'],
-                revenue_change_percent=result['revenue']['revenue_change_percent'],
-                current_profit=result['profit']['current_daily_profit'],
-                predicted_profit=result['profit']['predicted_daily_profit'],
-                profit_change_percent=result['profit']['profit_change_percent'],
-                simulation_days=result['simulation_days'],
-                elasticity_used=elasticity
-            )
+            scenario = Scenario(**self._scenario_row(result, elasticity))
             
             db.session.add(scenario)
             db.session.commit()
@@ -247,41 +556,55 @@ class ScenarioSimulator:
             db.session.rollback()
             print(f"Error saving scenario: {e}")
     
+    def _save_scenarios_bulk(self, results, elasticities):
+        """Save many scenarios with one batched INSERT and a single commit"""
+        if not results:
+            return
+        
+        # Bulk INSERT skips mapper events, so apply the timestamp fallback here
+        timestamps = fallback_timestamps(Scenario.__table__)
+        rows = [
+            {**self._scenario_row(result, elasticity), **timestamps}
+            for result, elasticity in zip(results, elasticities)
+        ]
+        
+        try:
+            ids = db.session.scalars(_insert_scenarios_stmt, rows).all()
+            db.session.commit()
+            
+            for result, scenario_id in zip(results, ids):
+                result['scenario_id'] = scenario_id
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error saving scenarios: {e}")
+    
     def compare_scenarios(self, scenario_ids):
         """Compare multiple scenarios side by side"""
-        scenarios = Scenario.query.filter(Scenario.id.in_(scenario_ids)).all()
+        scenarios = Scenario.query.options(
+            joinedload(Scenario.product)
+        ).filter(Scenario.id.in_(scenario_ids)).all()
         
         if not scenarios:
             return {'error': 'No scenarios found'}
         
-        comparison = {
-            'scenarios': [],
-            'best_for_revenue': None,
-            'best_for_profit': None,
-            'best_for_volume': None
-        }
-        
-        max_revenue_change = float('-inf')
-        max_profit_change = float('-inf')
-        max_volume_change = float('-inf')
+        scenario_data = [scenario.to_dict() for scenario in scenarios]
         
-        for scenario in scenarios:
-            scenario_data = scenario.to_dict()
-            comparison['scenarios'].append(scenario_data)
-            
-            if scenario.revenue_change_percent > max_revenue_change:
-                max_revenue_change = scenario.revenue_change_percent
-                comparison['best_for_revenue'] = scenario_data
-            
-            if scenario.profit_change_percent > max_profit_change:
-                max_profit_change = scenario.profit_change_percent
-                comparison['best_for_profit'] = scenario_data
-            
-            if scenario.demand_change_percent > max_volume_change:
-                max_volume_change = scenario.demand_change_percent
-                comparison['best_for_volume'] = scenario_data
+        def best_for(column):
+            # First scenario with the highest value; missing values never win
+            values = np.array(
+                [getattr(scenario, column) for scenario in scenarios], dtype=float
+            )
+            if np.isnan(values).all():
+                return None
+            return scenario_data[int(np.nanargmax(values))]
         
-        return comparison
+        return {
+            'scenarios': scenario_data,
+            'best_for_revenue': best_for('revenue_change_percent'),
+            'best_for_profit': best_for('profit_change_percent'),
+            'best_for_volume': best_for('demand_change_percent')
+        }
     
     def simulate_competitive_response(self, product_id, our_price_change, competitor_response):
         """
@@ -292,16 +615,16 @@ class ScenarioSimulator:
             our_price_change: Our price change percentage
             competitor_response: Dict with competitor response {delay_days, match_percent}
         """
-        product = Product.query.get(product_id)
-        if not product:
-            return {'error': 'Product not found'}
+        baseline = self._get_baseline(product_id)
+        if isinstance(baseline, str):
+            return {'error': baseline}
         
-        current_price = product.current_price
+        current_price = baseline.current_price
         new_price = current_price * (1 + our_price_change / 100)
         
         # Phase 1: Before competitor responds
-        phase1 = self.simulate_scenario(
-            product_id, 
+        phase1 = self._simulate_with_baseline(
+            baseline, 
             new_price, 
             simulation_days=competitor_response.get('delay_days', 7),
             scenario_name="Phase 1: Before Competitor Response"
@@ -315,8 +638,8 @@ class ScenarioSimulator:
         effective_price_change = our_price_change * (1 - match_percent / 100)
         effective_new_price = current_price * (1 + effective_price_change / 100)
         
-        phase2 = self.simulate_scenario(
-            product_id,
+        phase2 = self._simulate_with_baseline(
+            baseline,
             effective_new_price,
             simulation_days=30,
             scenario_name="Phase 2: After Competitor Response"
@@ -324,7 +647,7 @@ class ScenarioSimulator:
         
         return {
             'product_id': product_id,
-            'product_name': product.name,
+            'product_name': baseline.product_name,
             'our_price_change': our_price_change,
             'competitor': {
                 'delay_days': competitor_response.get('delay_days'),
@@ -346,86 +669,120 @@ class ScenarioSimulator:
     
     def simulate_seasonal_scenario(self, product_id, new_price, season):
         """Simulate scenario with seasonal adjustments"""
-        # Get seasonal multipliers from historical data
-        sales = Sale.query.filter_by(product_id=product_id).all()
+        baseline = self._get_baseline(product_id)
+        if isinstance(baseline, str):
+            return {'error': baseline}
         
-        df = pd.DataFrame([{
-            'season': sale.season,
-            'quantity': sale.quantity
-        } for sale in sales if sale.season])
+        # Get seasonal multipliers from historical data
+        season_totals = db.session.query(
+            Sale.season,
+            func.sum(Sale.quantity),
+            func.count(Sale.id)
+        ).filter(
+            Sale.product_id == product_id,
+            Sale.season.isnot(None),
+            Sale.season != ''
+        ).group_by(Sale.season).all()
         
-        if df.empty:
-            return self.simulate_scenario(product_id, new_price, 30)
+        if not season_totals:
+            return self._simulate_with_baseline(baseline, new_price, 30)
         
         # Calculate seasonal factors
-        avg_quantity = df['quantity'].mean()
-        seasonal_factors = df.groupby('season')['quantity'].mean() / avg_quantity
+        avg_quantity = sum(total for _, total, _ in season_totals) / sum(count for _, _, count in season_totals)
+        seasonal_factors = {
+            name: (total / count) / avg_quantity
+            for name, total, count in season_totals
+        }
         
         season_factor = seasonal_factors.get(season, 1.0)
         
-        # Run base simulation
-        base_scenario = self.simulate_scenario(product_id, new_price, 30)
-        
-        # Adjust for seasonality
-        base_scenario['demand']['predicted_daily_quantity'] *= season_factor
-        base_scenario['demand']['seasonal_adjustment'] = season_factor
-        base_scenario['demand']['season'] = season
-        
-        # Recalculate revenue and profit
-        pred_qty = base_scenario['demand']['predicted_daily_quantity']
-        pred_rev = new_price * pred_qty
-        
-        product = Product.query.get(product_id)
-        pred_profit = (new_price - product.unit_cost) * pred_qty
+        # Run simulation with seasonal demand
+        scenario = self._simulate_with_baseline(baseline, new_price, 30, demand_multiplier=season_factor)
+        if 'error' in scenario:
+            return scenario
         
-        base_scenario['revenue']['predicted_daily_revenue'] = round(pred_rev, 2)
-        base_scenario['profit']['predicted_daily_profit'] = round(pred_profit, 2)
+        scenario['demand']['seasonal_adjustment'] = season_factor
+        scenario['demand']['season'] = season
         
-        return base_scenario
+        return scenario
     
-    def bulk_simulate(self, product_ids, price_changes):
+    def bulk_simulate(self, product_ids, price_changes, as_of=None):
         """
         Simulate multiple price changes across multiple products
         
         Args:
             product_ids: List of product IDs
             price_changes: List of price change percentages
+            as_of: Date the sales history window ends on (defaults to today)
             
         Returns:
             dict: Results for all combinations
         """
+        date_threshold = (as_of or date.today()) - timedelta(days=BASELINE_WINDOW_DAYS)
+        baselines_by_id = _load_bulk_baselines(product_ids, date_threshold)
+        
+        # Products with enough history to simulate, in request order
+        baselines = [
+            baselines_by_id[product_id] for product_id in product_ids
+            if product_id in baselines_by_id and baselines_by_id[product_id].sales_count >= 10
+        ]
+        
         results = []
+        elasticities = []
+        summary = {
+            'total_scenarios': 0,
+            'total_revenue_impact': 0,
+            'total_profit_impact': 0,
+            'average_revenue_change_percent': 0
+        }
         
-        for product_id in product_ids:
-            product = Product.query.get(product_id)
-            if not product:
-                continue
+        if baselines and price_changes:
+            grid = _project_grid(baselines, price_changes)
+            
+            # Same limits simulate_scenario enforces
+            within_limits = (grid['price_change_percent'] >= -30) & (grid['price_change_percent'] <= 20)
+            rows, cols = np.nonzero(within_limits)
             
-            for price_change in price_changes:
-                new_price = product.current_price * (1 + price_change / 100)
+            # Flat per-scenario arrays, in product-then-price order
+            cells = {key: values[rows, cols] for key, values in grid.items()}
+            
+            if len(rows):
+                current_revenue = np.array([b.avg_revenue for b in baselines])[rows] * 30
+                current_profit = np.array([b.avg_profit for b in baselines])[rows] * 30
+                revenue_changes = np.round(cells['predicted_revenue'] * 30 - current_revenue, 2)
+                profit_changes = np.round(cells['predicted_profit'] * 30 - current_profit, 2)
                 
-                scenario = self.simulate_scenario(
-                    product_id,
-                    new_price,
-                    simulation_days=30,
-                    scenario_name=f"{product.name} - {price_change:+.1f}%"
-                )
+                summary = {
+                    'total_scenarios': len(rows),
+                    'total_revenue_impact': round(float(revenue_changes.sum()), 2),
+                    'total_profit_impact': round(float(profit_changes.sum()), 2),
+                    'average_revenue_change_percent': round(
+                        float(np.round(cells['revenue_change_percent'], 2).mean()), 2
+                    )
+                }
+            
+            for n, (i, j) in enumerate(zip(rows, cols)):
+                baseline = baselines[i]
                 
-                if 'error' not in scenario:
-                    results.append(scenario)
-        
-        # Aggregate results
-        total_revenue_impact = sum(r['revenue']['total_revenue_change'] for r in results)
-        total_profit_impact = sum(r['profit']['total_profit_change'] for r in results)
+                scenario = self._build_result(
+                    f"{baseline.product_name} - {price_changes[j]:+.1f}%",
+                    baseline,
+                    float(cells['new_price'][n]),
+                    30,
+                    float(cells['price_change_percent'][n]),
+                    float(cells['quantity_change_percent'][n]),
+                    float(cells['predicted_quantity'][n]),
+                    float(cells['predicted_revenue'][n]),
+                    float(cells['predicted_profit'][n]),
+                    float(cells['revenue_change_percent'][n]),
+                    float(cells['profit_change_percent'][n])
+                )
+                results.append(scenario)
+                elasticities.append(baseline.elasticity_coefficient)
+            
+            self._save_scenarios_bulk(results, elasticities)
         
         return {
             'scenarios': results,
-            'summary': {
-                'total_scenarios': len(results),
-                'total_revenue_impact': round(total_revenue_impact, 2),
-                'total_profit_impact': round(total_profit_impact, 2),
-                'average_revenue_change_percent': round(
-                    sum(r['revenue']['revenue_change_percent'] for r in results) / len(results), 2
-                ) if results else 0
-            }
+            'summary': summary
         }
@@ -2,7 +2,13 @@
 """Quick test of API endpoints"""
 
 from app import app
+from models import db
 from flask import json
+from testutils import count_queries
+
+# Upper bound on statements per list request; more means a to_dict() lazy load
+# or a per-row lookup
+MAX_LIST_QUERIES = 3
 
 with app.test_client() as client:
     # Test health endpoint
@@ -44,3 +50,36 @@ with app.test_client() as client:
         print(f'  Status: {data.get("status")}')
         print(f'  Total products: {data.get("total_products")}')
         print(f'  Total sales: {data.get("total_sales")}')
+    
+    # Guard endpoints that serialize ORM rows through to_dict() against N+1
+    # regressions: the statement count must not grow with the row count
+    with app.app_context():
+        engine = db.engine
+    
+    scenario_ids = [s['id'] for s in client.get('/api/scenarios?limit=20').get_json()['scenarios']]
+    
+    checks = [
+        ('/api/products?include_elasticity=true',
+         lambda n: client.get(f'/api/products?include_elasticity=true&per_page={n}')),
+        ('/api/scenarios',
+         lambda n: client.get(f'/api/scenarios?limit={n}')),
+        ('/api/scenarios/compare',
+         lambda n: client.post('/api/scenarios/compare', json={'scenario_ids': scenario_ids[:n]})),
+    ]
+    
+    for name, fetch in checks:
+        if name == '/api/scenarios/compare' and not scenario_ids:
+            print(f"\nSkipping {name} query count (no saved scenarios)")
+            continue
+        
+        print(f"\nTesting {name} query count...")
+        counts = []
+        for rows in (2, 20):
+            with count_queries(engine) as queries:
+                response = fetch(rows)
+            assert response.status_code == 200, f'{name} returned {response.status_code}'
+            counts.append(len(queries))
+        
+        print(f'  Queries for 2 / 20 rows: {counts[0]} / {counts[1]}')
+        assert counts[0] == counts[1], f'{name} query count grows with rows: {counts}'
+        assert counts[1] <= MAX_LIST_QUERIES, f'{name} issued {counts[1]} queries'
@@ -0,0 +1,27 @@
+"""
+Helpers for the API checks in test_api.py
+"""
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Record every SQL statement `engine` executes inside the block
+    
+    Yields the list the statements are appended to, so callers can assert
+    on len(queries) to catch N+1 lazy loads sneaking back into to_dict()
+    paths.
+    """
+    queries = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+    
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
@@ -4,13 +4,19 @@ Generate realistic synthetic sales data for Dynamic Pricing Optimization
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
-import random
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import os
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Independent seeded random streams for the catalog, sales and competitor
+# prices, so sales and competitor data can be generated concurrently and
+# still be reproducible
+SEED = 42
+PRODUCT_SEED, SALES_SEED, COMPETITOR_SEED = np.random.SeedSequence(SEED).spawn(3)
 
 # Configuration
 # Generate data for the last 2 years up to today
@@ -18,6 +24,10 @@ END_DATE = datetime.now()
 START_DATE = END_DATE - timedelta(days=730)  # 2 years of data
 NUM_PRODUCTS = 50
 
+# Rows per Parquet row group; sales are also generated in product blocks of
+# about this many rows so the full table never has to sit in memory
+ROW_GROUP_SIZE = 262144
+
 # Product categories and their characteristics
 CATEGORIES = {
     'Electronics': {
@@ -74,189 +84,333 @@ BRANDS = ['BrandA', 'BrandB', 'BrandC', 'BrandD', 'BrandE', 'Premium', 'Value',
 
 COMPETITORS = ['CompetitorX', 'CompetitorY', 'CompetitorZ', 'MarketLeader']
 
+# Category, subcategory and brand names as arrays for batched index draws.
+# Subcategories are flattened; a category's options are the
+# SUBCATEGORY_COUNTS[c] entries starting at SUBCATEGORY_OFFSETS[c].
+CATEGORY_NAMES = np.array(list(CATEGORIES))
+SUBCATEGORY_NAMES = np.array([sub for cat in CATEGORIES.values() for sub in cat['subcategories']])
+SUBCATEGORY_COUNTS = np.array([len(cat['subcategories']) for cat in CATEGORIES.values()])
+SUBCATEGORY_OFFSETS = np.cumsum(SUBCATEGORY_COUNTS) - SUBCATEGORY_COUNTS
+BRAND_NAMES = np.array(BRANDS)
+
+SEASONS = ['Winter', 'Spring', 'Summer', 'Fall']
+
+# Category characteristics as parallel arrays, indexed like CATEGORY_NAMES
+COST_MARGIN = np.array([cat['cost_margin'] for cat in CATEGORIES.values()])
+PRICE_LO, PRICE_HI = np.array([cat['price_range'] for cat in CATEGORIES.values()], dtype=float).T
+ELASTICITY_LO, ELASTICITY_HI = np.array([cat['elasticity_range'] for cat in CATEGORIES.values()]).T
+BASE_DEMAND_LO, BASE_DEMAND_HI = np.array([cat['base_demand'] for cat in CATEGORIES.values()], dtype=float).T
+# Seasonal demand multiplier, (categories, seasons)
+SEASON_TABLE = np.array([
+    [cat['seasonality'][season] for season in SEASONS] for cat in CATEGORIES.values()
+])
+
+# Weekday names indexed by DatetimeIndex.dayofweek (Monday=0)
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
+# Index into SEASONS for each month, January first
+MONTH_SEASON = np.array([0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+
+# Major holidays as (month, day)
+HOLIDAYS = [
+    (1, 1),   # New Year
+    (2, 14),  # Valentine's
+    (7, 4),   # July 4th
+    (10, 31), # Halloween
+    (11, 24), # Thanksgiving (approx)
+    (12, 25), # Christmas
+    (11, 25), # Black Friday
+    (12, 26)  # Boxing Day
+]
+
+# HOLIDAYS encoded as month * 100 + day for array membership tests
+HOLIDAY_KEYS = np.array([month * 100 + day for month, day in HOLIDAYS])
+
+
+def season_index(dates):
+    """Index into SEASONS for every date in a DatetimeIndex"""
+    return MONTH_SEASON[dates.month.to_numpy() - 1]
+
+
+def holiday_mask(dates):
+    """Boolean array marking the major holidays in a DatetimeIndex"""
+    return np.isin(dates.month.to_numpy() * 100 + dates.day.to_numpy(), HOLIDAY_KEYS)
+
 
-def get_season(date):
-    """Determine season from date"""
-    month = date.month
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Spring'
-    elif month in [6, 7, 8]:
-        return 'Summer'
-    else:
-        return 'Fall'
-
-
-def is_holiday(date):
-    """Check if date is a major holiday"""
-    holidays = [
-        (1, 1),   # New Year
-        (2, 14),  # Valentine's
-        (7, 4),   # July 4th
-        (10, 31), # Halloween
-        (11, 24), # Thanksgiving (approx)
-        (12, 25), # Christmas
-        (11, 25), # Black Friday
-        (12, 26)  # Boxing Day
-    ]
-    return (date.month, date.day) in holidays
-
-
-def generate_products():
+# Daily calendar for the generated period; HOLIDAY_CAL[i] flags whether day i
+# (counted from START_DATE) is a holiday, computed once at import
+DATE_RANGE = pd.date_range(START_DATE, END_DATE, freq='D')
+HOLIDAY_CAL = holiday_mask(DATE_RANGE)
+
+
+def generate_products(rng=None):
     """Generate product catalog"""
-    products = []
+    rng = np.random.default_rng(PRODUCT_SEED if rng is None else rng)
     
-    for i in range(NUM_PRODUCTS):
-        category = random.choice(list(CATEGORIES.keys()))
-        cat_data = CATEGORIES[category]
-        
-        subcategory = random.choice(cat_data['subcategories'])
-        brand = random.choice(BRANDS)
-        
-        # Generate price
-        base_price = random.uniform(*cat_data['price_range'])
-        unit_cost = base_price * (1 - cat_data['cost_margin'])
-        
-        # Price elasticity (true elasticity for simulation)
-        elasticity = random.uniform(*cat_data['elasticity_range'])
-        
-        # Base demand
-        base_demand = random.uniform(*cat_data['base_demand'])
-        
-        products.append({
-            'sku': f'SKU{i+1:04d}',
-            'name': f'{brand} {subcategory} {i+1}',
-            'category': category,
-            'subcategory': subcategory,
-            'brand': brand,
-            'unit_cost': round(unit_cost, 2),
-            'current_price': round(base_price, 2),
-            'true_elasticity': elasticity,  # For simulation only
-            'base_demand': base_demand,     # For simulation only
-            'currency': 'USD'
-        })
-    
-    return pd.DataFrame(products)
-
-
-def generate_sales_data(products_df):
+    # Draw category, subcategory and brand for every product at once
+    category_idx = rng.integers(0, len(CATEGORY_NAMES), NUM_PRODUCTS)
+    subcategory_idx = (SUBCATEGORY_OFFSETS[category_idx] +
+                       rng.integers(0, SUBCATEGORY_COUNTS[category_idx]))
+    brand_idx = rng.integers(0, len(BRAND_NAMES), NUM_PRODUCTS)
+    
+    # Price, elasticity and demand drawn from each product's category ranges
+    base_price = rng.uniform(PRICE_LO[category_idx], PRICE_HI[category_idx])
+    unit_cost = base_price * (1 - COST_MARGIN[category_idx])
+    elasticity = rng.uniform(ELASTICITY_LO[category_idx], ELASTICITY_HI[category_idx])
+    base_demand = rng.uniform(BASE_DEMAND_LO[category_idx], BASE_DEMAND_HI[category_idx])
+    
+    products_df = pd.DataFrame({
+        'category': CATEGORY_NAMES[category_idx],
+        'subcategory': SUBCATEGORY_NAMES[subcategory_idx],
+        'brand': BRAND_NAMES[brand_idx],
+        'unit_cost': np.round(unit_cost, 2),
+        'current_price': np.round(base_price, 2),
+        'true_elasticity': elasticity,  # For simulation only
+        'base_demand': base_demand,     # For simulation only
+        'currency': 'USD'
+    })
+    
+    # SKU and display name built column-wise rather than per row
+    number = pd.Series(np.arange(1, NUM_PRODUCTS + 1)).astype(str)
+    products_df.insert(0, 'sku', number.str.zfill(4).radd('SKU'))
+    products_df.insert(1, 'name', products_df['brand'] + ' ' + products_df['subcategory'] + ' ' + number)
+    
+    return products_df
+
+
+def date_array(dates):
+    """Arrow-backed date32 array from a DatetimeIndex or datetime64[D] values"""
+    return pd.arrays.ArrowExtensionArray(pa.array(np.asarray(dates, dtype='datetime64[D]')))
+
+
+def simulate_demand(base_price, elasticity, base_demand, calendar_factor,
+                    promotion, price_variation, discount_percent, noise):
+    """
+    Daily selling price and units sold from pre-drawn random inputs
+    
+    Pure array arithmetic with no random draws of its own, so it is
+    deterministic for given inputs. Product attributes are (products, 1) column
+    vectors. Everything else is (products, days) or broadcasts to it.
+    
+    Returns:
+        tuple: (price, quantity) arrays shaped (products, days)
+    """
+    price = base_price * price_variation * (1 - discount_percent / 100)
+    promotion_factor = np.where(promotion, 1.4, 1.0)
+    
+    # Calculate demand using elasticity
+    # Q = Q0 * (P / P0) ^ elasticity
+    quantity_factor = (price / base_price) ** elasticity
+    
+    # Combine all factors
+    expected_quantity = base_demand * calendar_factor * promotion_factor * quantity_factor
+    
+    # Add noise
+    quantity = np.maximum(0, (expected_quantity * noise).astype(np.int32))
+    
+    return price, quantity
+
+
+def generate_sales_data(products_df, rng=None):
     """Generate historical sales data"""
-    sales_data = []
+    rng = np.random.default_rng(SALES_SEED if rng is None else rng)
+    date_range = DATE_RANGE
+    num_products = len(products_df)
+    num_days = len(date_range)
+    shape = (num_products, num_days)
     
-    date_range = pd.date_range(START_DATE, END_DATE, freq='D')
+    # Product attributes as column vectors, broadcast against the day axis
+    base_price = products_df['current_price'].to_numpy()[:, None]
+    unit_cost = products_df['unit_cost'].to_numpy()[:, None]
+    elasticity = products_df['true_elasticity'].to_numpy()[:, None]
+    base_demand = products_df['base_demand'].to_numpy()[:, None]
     
-    for _, product in products_df.iterrows():
-        product_id = _ + 1
-        category = product['category']
-        cat_data = CATEGORIES[category]
-        
-        base_price = product['current_price']
-        unit_cost = product['unit_cost']
-        elasticity = product['true_elasticity']
-        base_demand = product['base_demand']
-        
-        for date in date_range:
-            # Seasonal adjustment
-            season = get_season(date)
-            seasonal_factor = cat_data['seasonality'][season]
-            
-            # Day of week effect (weekends have higher sales)
-            day_of_week = date.strftime('%A')
-            weekend_factor = 1.2 if day_of_week in ['Saturday', 'Sunday'] else 1.0
-            
-            # Holiday effect
-            holiday = is_holiday(date)
-            holiday_factor = 1.3 if holiday else 1.0
-            
-            # Random promotion (10% chance)
-            promotion = random.random() < 0.1
-            promotion_factor = 1.4 if promotion else 1.0
-            
-            # Price variation (±10% from base price)
-            price_variation = random.uniform(0.9, 1.1)
-            price = base_price * price_variation
-            
-            # Discount for promotions
-            discount_percent = 0
-            if promotion:
-                discount_percent = random.uniform(10, 25)
-                price = price * (1 - discount_percent / 100)
-            
-            # Calculate demand using elasticity
-            # Q = Q0 * (P / P0) ^ elasticity
-            price_ratio = price / base_price
-            quantity_factor = price_ratio ** elasticity
-            
-            # Combine all factors
-            expected_quantity = (base_demand * seasonal_factor * weekend_factor * 
-                               holiday_factor * promotion_factor * quantity_factor)
-            
-            # Add noise
-            noise = np.random.normal(1, 0.15)  # 15% standard deviation
-            quantity = max(0, int(expected_quantity * noise))
-            
-            # Skip days with zero demand (random stockouts or no sales)
-            if random.random() < 0.05:  # 5% chance of no sales
-                continue
+    # Calendar features, one entry per day
+    seasons = season_index(date_range)
+    days_of_week = date_range.dayofweek.to_numpy()
+    holidays = HOLIDAY_CAL
+    
+    # Seasonal adjustment for every (product, day) from SEASON_TABLE
+    category_idx = pd.Index(CATEGORY_NAMES).get_indexer(products_df['category'])
+    seasonal_factor = SEASON_TABLE[category_idx[:, None], seasons[None, :]]
+    
+    # Day of week effect (weekends have higher sales)
+    weekend_factor = np.where(days_of_week >= 5, 1.2, 1.0)
+    
+    # Holiday effect
+    holiday_factor = np.where(holidays, 1.3, 1.0)
+    
+    # Random promotion (10% chance)
+    promotion = rng.random(shape) < 0.1
+    
+    # Price variation (±10% from base price)
+    price_variation = rng.uniform(0.9, 1.1, shape)
+    
+    # Discount for promotions
+    discount_percent = np.where(promotion, rng.uniform(10, 25, shape), 0.0)
+    
+    # Demand noise
+    noise = rng.normal(1, 0.15, shape)  # 15% standard deviation
+    
+    price, quantity = simulate_demand(
+        base_price, elasticity, base_demand,
+        seasonal_factor * weekend_factor * holiday_factor,
+        promotion, price_variation, discount_percent, noise
+    )
+    
+    # Competitor pricing
+    competitor_price = base_price * rng.uniform(0.85, 1.15, shape)
+    
+    # Calculate metrics
+    revenue = price * quantity
+    cost = unit_cost * quantity
+    profit = revenue - cost
+    
+    # Skip days with zero demand (random stockouts or no sales)
+    keep = rng.random(num_products * num_days) >= 0.05  # 5% chance of no sales
+    
+    columns = {
+        'product_id': np.repeat(products_df.index.to_numpy(np.int32) + 1, num_days),
+        'sku': np.repeat(np.arange(num_products), num_days),
+        'date': date_array(np.tile(date_range.values, num_products)),
+        'quantity': quantity.ravel(),
+        'price': np.round(price, 2).ravel(),
+        'revenue': np.round(revenue, 2).ravel(),
+        'cost': np.round(cost, 2).ravel(),
+        'profit': np.round(profit, 2).ravel(),
+        'discount_percent': np.round(discount_percent, 2).ravel(),
+        'competitor_price': np.round(competitor_price, 2).ravel(),
+        'season': np.tile(seasons, num_products),
+        'day_of_week': np.tile(days_of_week, num_products),
+        'is_holiday': np.tile(holidays, num_products),
+        'promotion_active': promotion.ravel()
+    }
+    
+    sales_df = pd.DataFrame({name: values[keep] for name, values in columns.items()})
+    
+    # Low-cardinality text columns are stored as categorical codes
+    sales_df['sku'] = pd.Categorical.from_codes(sales_df['sku'], categories=products_df['sku'])
+    sales_df['season'] = pd.Categorical.from_codes(sales_df['season'], categories=SEASONS)
+    sales_df['day_of_week'] = pd.Categorical.from_codes(
+        sales_df['day_of_week'], categories=DAY_NAMES, ordered=True
+    )
+    
+    return sales_df
+
+
+def generate_competitor_data(products_df, rng=None):
+    """Generate competitor pricing data"""
+    rng = np.random.default_rng(COMPETITOR_SEED if rng is None else rng)
+    date_range = pd.date_range(START_DATE, END_DATE, freq='W')  # Weekly
+    
+    product_ids = products_df.index.to_numpy(np.int32) + 1
+    skus = products_df['sku'].to_numpy().astype(str)
+    base_prices = products_df['current_price'].to_numpy()
+    
+    num_products = len(products_df)
+    num_weeks = len(date_range)
+    num_competitors = len(COMPETITORS)
+    shape = (num_products, num_weeks, num_competitors)
+    
+    # Competitor prices vary around our base price, all products at once
+    comp_prices = base_prices[:, None, None] * rng.uniform(0.80, 1.20, shape)
+    
+    # One URL per (product, competitor), repeated for every week
+    competitor_urls = np.char.add(
+        np.char.add('https://', np.char.lower(COMPETITORS)), '.com/product/'
+    )
+    urls = np.char.add(competitor_urls[None, :], np.char.lower(skus)[:, None])
+    
+    return pd.DataFrame({
+        'product_id': np.repeat(product_ids, num_weeks * num_competitors),
+        'sku': pd.Categorical.from_codes(
+            np.repeat(np.arange(num_products), num_weeks * num_competitors), categories=skus
+        ),
+        'competitor_name': pd.Categorical.from_codes(
+            np.tile(np.arange(num_competitors), num_products * num_weeks), categories=COMPETITORS
+        ),
+        'competitor_price': np.round(comp_prices, 2).ravel(),
+        'date': date_array(np.tile(np.repeat(date_range.values, num_competitors), num_products)),
+        'url': np.broadcast_to(urls[:, None, :], shape).ravel()
+    })
+
+
+def write_parquet(df, path):
+    """Write a generated table as snappy-compressed Parquet"""
+    df.to_parquet(path, engine='pyarrow', compression='snappy', row_group_size=ROW_GROUP_SIZE, index=False)
+
+
+CSV_WRITE_OPTIONS = pa_csv.WriteOptions(batch_size=65536)
+
+
+def write_csv(df, path):
+    """Write a generated table as CSV using Arrow's multithreaded writer"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(table, path, write_options=CSV_WRITE_OPTIONS)
+
+
+def table_file_name(name, as_csv=False):
+    """File name of a generated table in the requested format"""
+    return f'{name}.csv' if as_csv else f'{name}.parquet'
+
+
+def write_table(df, data_dir, name, as_csv=False):
+    """Write a generated table as Parquet, or CSV when requested; returns the file name"""
+    file_name = table_file_name(name, as_csv)
+    (write_csv if as_csv else write_parquet)(df, os.path.join(data_dir, file_name))
+    return file_name
+
+
+def write_sales(products_df, path, as_csv=False, rng=None):
+    """
+    Generate sales one product block at a time and stream them to a file
+    
+    Each block is about ROW_GROUP_SIZE rows and is written as a single row
+    group, so peak memory is bounded by the block rather than the whole table.
+    
+    Returns:
+        tuple: (rows written, total revenue, total profit)
+    """
+    rng = np.random.default_rng(SALES_SEED if rng is None else rng)
+    num_days = len(DATE_RANGE)
+    block_products = max(1, ROW_GROUP_SIZE // num_days)
+    
+    writer = None
+    num_rows, total_revenue, total_profit = 0, 0.0, 0.0
+    
+    try:
+        for start in range(0, len(products_df), block_products):
+            block_df = generate_sales_data(products_df.iloc[start:start + block_products], rng)
             
-            # Competitor pricing
-            competitor_price = base_price * random.uniform(0.85, 1.15)
+            # Every block must share the file's schema, including the width of
+            # the sku dictionary index, so categories span the whole catalog
+            block_df['sku'] = block_df['sku'].cat.set_categories(products_df['sku'])
+            table = pa.Table.from_pandas(block_df, preserve_index=False)
             
-            # Calculate metrics
-            revenue = price * quantity
-            cost = unit_cost * quantity
-            profit = revenue - cost
+            if writer is None:
+                if as_csv:
+                    writer = pa_csv.CSVWriter(path, table.schema, write_options=CSV_WRITE_OPTIONS)
+                else:
+                    writer = pq.ParquetWriter(path, table.schema, compression='snappy')
+            writer.write_table(table)
             
-            sales_data.append({
-                'product_id': product_id,
-                'sku': product['sku'],
-                'date': date.date(),
-                'quantity': quantity,
-                'price': round(price, 2),
-                'revenue': round(revenue, 2),
-                'cost': round(cost, 2),
-                'profit': round(profit, 2),
-                'discount_percent': round(discount_percent, 2),
-                'competitor_price': round(competitor_price, 2),
-                'season': season,
-                'day_of_week': day_of_week,
-                'is_holiday': holiday,
-                'promotion_active': promotion
-            })
-    
-    return pd.DataFrame(sales_data)
-
-
-def generate_competitor_data(products_df):
-    """Generate competitor pricing data"""
-    competitor_data = []
+            num_rows += len(block_df)
+            total_revenue += block_df['revenue'].sum()
+            total_profit += block_df['profit'].sum()
+    finally:
+        if writer is not None:
+            writer.close()
     
-    date_range = pd.date_range(START_DATE, END_DATE, freq='W')  # Weekly
-    
-    for _, product in products_df.iterrows():
-        product_id = _ + 1
-        base_price = product['current_price']
-        
-        for date in date_range:
-            for competitor in COMPETITORS:
-                # Competitor prices vary around our base price
-                comp_price = base_price * random.uniform(0.80, 1.20)
-                
-                competitor_data.append({
-                    'product_id': product_id,
-                    'sku': product['sku'],
-                    'competitor_name': competitor,
-                    'competitor_price': round(comp_price, 2),
-                    'date': date.date(),
-                    'url': f'https://{competitor.lower()}.com/product/{product["sku"].lower()}'
-                })
-    
-    return pd.DataFrame(competitor_data)
+    return num_rows, total_revenue, total_profit
 
 
 def main():
     """Generate all data files"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--csv', action='store_true',
+                        help='write sales and competitor data as CSV instead of Parquet')
+    args = parser.parse_args()
+    
     print("🏭 Generating Dynamic Pricing Data...")
     
     # Create data directory
@@ -270,19 +424,25 @@ def main():
     
     # Remove simulation-only columns before saving
     products_export = products_df.drop(columns=['true_elasticity', 'base_demand'])
-    products_export.to_csv(os.path.join(data_dir, 'products.csv'), index=False)
+    write_csv(products_export, os.path.join(data_dir, 'products.csv'))
     print(f"   ✓ Created {len(products_df)} products")
     
-    # Generate sales data
-    print("💰 Generating sales data (this may take a minute)...")
-    sales_df = generate_sales_data(products_df)
-    sales_df.to_csv(os.path.join(data_dir, 'sales_data.csv'), index=False)
-    print(f"   ✓ Created {len(sales_df):,} sales transactions")
+    # Sales and competitor data only share the catalog, so generate them
+    # concurrently; the NumPy and Arrow work releases the GIL
+    print("💰 Generating sales and competitor pricing data...")
+    sales_file = table_file_name('sales_data', args.csv)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sales_future = executor.submit(
+            write_sales, products_df, os.path.join(data_dir, sales_file), args.csv
+        )
+        competitors_future = executor.submit(generate_competitor_data, products_df)
+        
+        competitors_df = competitors_future.result()
+        competitors_file = write_table(competitors_df, data_dir, 'competitors', args.csv)
+        num_sales, total_revenue, total_profit = sales_future.result()
     
-    # Generate competitor data
-    print("🏪 Generating competitor pricing data...")
-    competitors_df = generate_competitor_data(products_df)
-    competitors_df.to_csv(os.path.join(data_dir, 'competitors.csv'), index=False)
+    print(f"   ✓ Created {num_sales:,} sales transactions")
     print(f"   ✓ Created {len(competitors_df):,} competitor price points")
     
     # Generate summary statistics
@@ -290,17 +450,17 @@ def main():
     print(f"   Date Range: {START_DATE.date()} to {END_DATE.date()}")
     print(f"   Products: {len(products_df)}")
     print(f"   Categories: {len(CATEGORIES)}")
-    print(f"   Sales Transactions: {len(sales_df):,}")
-    print(f"   Total Revenue: ${sales_df['revenue'].sum():,.2f}")
-    print(f"   Total Profit: ${sales_df['profit'].sum():,.2f}")
-    print(f"   Average Daily Sales per Product: {len(sales_df) / len(products_df) / len(pd.date_range(START_DATE, END_DATE)):.1f}")
+    print(f"   Sales Transactions: {num_sales:,}")
+    print(f"   Total Revenue: ${total_revenue:,.2f}")
+    print(f"   Total Profit: ${total_profit:,.2f}")
+    print(f"   Average Daily Sales per Product: {num_sales / len(products_df) / len(DATE_RANGE):.1f}")
     
     print("\n✨ Data generation complete!")
     print(f"📁 Files saved in: {data_dir}")
     print("\nFiles created:")
     print("   - products.csv")
-    print("   - sales_data.csv")
-    print("   - competitors.csv")
+    print(f"   - {sales_file}")
+    print(f"   - {competitors_file}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Quick check that sales streamed over several product blocks stay readable"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+import generate_data
+
+
+def check_write_sales_multiple_blocks(as_csv):
+    """
+    Stream a catalog large enough to need two blocks and read it back
+    
+    400 products split into a 358-product block and a 42-product block,
+    which is where per-block sku categories used to give the blocks
+    different dictionary index widths and mismatched schemas.
+    """
+    num_products = generate_data.NUM_PRODUCTS
+    generate_data.NUM_PRODUCTS = 400
+    try:
+        products_df = generate_data.generate_products()
+    finally:
+        generate_data.NUM_PRODUCTS = num_products
+    
+    block_products = generate_data.ROW_GROUP_SIZE // len(generate_data.DATE_RANGE)
+    assert len(products_df) > block_products, 'catalog fits in a single block'
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, generate_data.table_file_name('sales_data', as_csv))
+        num_rows, total_revenue, _ = generate_data.write_sales(products_df, path, as_csv)
+        sales_df = pd.read_csv(path) if as_csv else pd.read_parquet(path)
+    
+    assert len(sales_df) == num_rows, f'wrote {num_rows} rows, read {len(sales_df)}'
+    assert sales_df['product_id'].nunique() == len(products_df)
+    assert abs(sales_df['revenue'].sum() - total_revenue) < 0.01 * len(sales_df)
+    
+    # Each row's sku still belongs to its product
+    expected_sku = products_df['sku'].to_numpy()[sales_df['product_id'].to_numpy() - 1]
+    assert (sales_df['sku'].astype(str).to_numpy() == expected_sku).all()
+    
+    print(f'  {"CSV" if as_csv else "Parquet"}: {num_rows:,} rows from {len(products_df)} products')
+
+
+if __name__ == '__main__':
+    print("Testing write_sales over multiple product blocks...")
+    check_write_sales_multiple_blocks(as_csv=False)
+    check_write_sales_multiple_blocks(as_csv=True)